@@ -26,10 +26,20 @@ import math
 import argparse
 import csv
 from dataclasses import dataclass
-from typing import Optional, List
+from functools import lru_cache
+from typing import Final, Optional, List
+
+try:
+    import numpy as np
+    import mop_batch
+except ImportError:  # NumPy not installed - batch functions unavailable
+    np = None
+    mop_batch = None
 
 # High-precision mathematical constants for gear metrology
 PI_HIGH_PRECISION = 3.1415926535897932384626433832795028841971693993751
+DEG2RAD: Final[float] = PI_HIGH_PRECISION / 180.0
+RAD2DEG: Final[float] = 180.0 / PI_HIGH_PRECISION
 
 # ---------- Involute helpers ----------
 def inv(x: float) -> float:
@@ -97,7 +107,7 @@ def mow_spur_external_dp(z: int, DP: float, alpha_deg: float, t: float, d: float
     d_precise = float(d)
     
     # High-precision angle conversion
-    alpha = alpha_deg_precise * (PI_HIGH_PRECISION / 180.0)
+    alpha = alpha_deg_precise * DEG2RAD
 
     # Basic geometry with high precision
     Dp = z_precise / DP_precise
@@ -123,7 +133,40 @@ def mow_spur_external_dp(z: int, DP: float, alpha_deg: float, t: float, d: float
         method=method, MOW=MOW,
         Dp=Dp, Db=Db, E=E,
         inv_alpha=inv_alpha, inv_beta=inv_beta,
-        beta_rad=beta, beta_deg=beta * (180.0 / PI_HIGH_PRECISION),
+        beta_rad=beta, beta_deg=beta * RAD2DEG,
+        C2=C2, factor=factor
+    )
+
+def mow_spur_external_batch(z, DP, alpha_deg, t, d) -> Result:
+    """
+    Vectorized mow_spur_external_dp for 1-D arrays (struct-of-arrays input).
+    Same equations and Newton-Raphson limits as the scalar function, evaluated
+    for the whole batch at once; values agree with it to within a few ULP.
+    Requires NumPy.
+    
+    Returns:
+        Result whose fields are NumPy arrays (method is an array of labels);
+        MOW is NaN where the contact-angle solve did not converge
+        (see mop_batch.py)
+    """
+    if mop_batch is None:
+        raise ImportError("mow_spur_external_batch requires NumPy")
+    
+    z = np.asarray(z, dtype=np.int64)
+    DP = np.asarray(DP, dtype=np.float64)
+    alpha_deg = np.asarray(alpha_deg, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    d = np.asarray(d, dtype=np.float64)
+    if np.any(z <= 0) or np.any(DP <= 0) or np.any(d <= 0) or np.any(t <= 0):
+        raise ValueError("All inputs must be positive (z, DP, alpha, t, d).")
+    
+    MOW, Dp, Db, E, inv_alpha, inv_beta, beta, C2, factor = mop_batch.spur_batch(z, DP, alpha_deg, t, d)
+    
+    return Result(
+        method=np.where(z % 2 == 0, "2-pin", "odd tooth"), MOW=MOW,
+        Dp=Dp, Db=Db, E=E,
+        inv_alpha=inv_alpha, inv_beta=inv_beta,
+        beta_rad=beta, beta_deg=beta * RAD2DEG,
         C2=C2, factor=factor
     )
 
@@ -147,7 +190,7 @@ def mbp_spur_internal_dp(z: int, DP: float, alpha_deg: float, s: float, d: float
     d_precise = float(d)
     
     # High-precision angle conversion
-    alpha = alpha_deg_precise * (PI_HIGH_PRECISION / 180.0)
+    alpha = alpha_deg_precise * DEG2RAD
 
     # Basic geometry with high precision
     Dp = z_precise / DP_precise
@@ -192,11 +235,14 @@ def mbp_spur_internal_dp(z: int, DP: float, alpha_deg: float, s: float, d: float
         method=method, MOW=MBP,  # Using MOW field for MBP value
         Dp=Dp, Db=Db, E=E,
         inv_alpha=inv_alpha, inv_beta=inv_beta,
-        beta_rad=beta, beta_deg=beta * (180.0 / PI_HIGH_PRECISION),
+        beta_rad=beta, beta_deg=beta * RAD2DEG,
         C2=R_pin_center * 2.0, factor=factor  # C2 represents pin center diameter
     )
 
 # ---------- Helical Gear Helper Functions ----------
+# Memoized: callers hit a small set of (PA, helix, DP) families repeatedly.
+# typed=True so the spur shortcut never hands back an int where a float was passed.
+@lru_cache(maxsize=4096, typed=True)
 def helical_conversions(normal_pa_deg: float, helix_deg: float, normal_dp: float):
     """
     Convert between normal and transverse parameters for helical gears.
@@ -215,19 +261,19 @@ def helical_conversions(normal_pa_deg: float, helix_deg: float, normal_dp: float
         return normal_pa_deg, normal_dp, 0.0, 0.0
     
     # Convert to radians
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
-    normal_pa_rad = normal_pa_deg * (PI_HIGH_PRECISION / 180.0)
+    helix_rad = helix_deg * DEG2RAD
+    normal_pa_rad = normal_pa_deg * DEG2RAD
     
     # Transverse pressure angle: tan(αt) = tan(αn) / cos(β)
     trans_pa_rad = math.atan(math.tan(normal_pa_rad) / math.cos(helix_rad))
-    trans_pa_deg = trans_pa_rad * (180.0 / PI_HIGH_PRECISION)
+    trans_pa_deg = trans_pa_rad * RAD2DEG
     
     # Transverse DP: DPt = DPn × cos(β)
     trans_dp = normal_dp * math.cos(helix_rad)
     
     # Base helix angle: tan(βb) = tan(β) × cos(αt)
     base_helix_rad = math.atan(math.tan(helix_rad) * math.cos(trans_pa_rad))
-    base_helix_deg = base_helix_rad * (180.0 / PI_HIGH_PRECISION)
+    base_helix_deg = base_helix_rad * RAD2DEG
     
     # Lead coefficient for potential future use
     lead_coeff = math.tan(helix_rad)
@@ -256,8 +302,8 @@ def calculate_improved_helical_correction(helix_deg: float, normal_pa_deg: float
         return 0.0
     
     # Convert to radians
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
-    normal_pa_rad = normal_pa_deg * (PI_HIGH_PRECISION / 180.0)
+    helix_rad = helix_deg * DEG2RAD
+    normal_pa_rad = normal_pa_deg * DEG2RAD
     
     # Select coefficient set based on helix angle range
     helix_abs = abs(helix_deg)
@@ -283,22 +329,44 @@ def calculate_improved_helical_correction(helix_deg: float, normal_pa_deg: float
         else:  # 25° to 45°
             A_sin, B_tan, C_sin2, D_exp = 0.790, 0.265, 0.195, 0.038
     
-    # Calculate trigonometric values
+    # Calculate trigonometric values (tan from the sin/cos pair, one libm call fewer)
     sin_helix = math.sin(helix_rad)
-    tan_helix = math.tan(helix_rad)
+    tan_helix = sin_helix / math.cos(helix_rad)
     sin_pa = math.sin(normal_pa_rad)
     cos_pa = math.cos(normal_pa_rad)
     
-    # Multi-term correction formula
-    term1 = A_sin * sin_helix * sin_pa * pin_diameter         # Linear term
-    term2 = B_tan * tan_helix * cos_pa * pin_diameter         # Tangent complement  
-    term3 = C_sin2 * (sin_helix ** 2) * pin_diameter          # Quadratic term
-    term4 = D_exp * (math.exp(helix_rad/10) - 1) * pin_diameter  # Exponential term
+    # Multi-term correction formula, pin diameter factored out of the sum.
+    # Linear + quadratic terms (A*sin_pa*s + C*s^2) are one polynomial in s = sin(helix),
+    # evaluated in Horner form: s*(A*sin_pa + C*s)
+    sin_terms = sin_helix * (A_sin * sin_pa + C_sin2 * sin_helix)  # Linear + quadratic terms
+    tan_term = B_tan * tan_helix * cos_pa                          # Tangent complement
+    exp_term = D_exp * math.expm1(helix_rad / 10)                  # Exponential term (e^x - 1 without cancellation)
     
-    total_correction = term1 + term2 + term3 + term4
+    total_correction = (sin_terms + tan_term + exp_term) * pin_diameter
     
     return total_correction
 
+def enable_jit() -> bool:
+    """
+    Compile inv_inverse and calculate_improved_helical_correction with Numba.
+    
+    Opt-in, so importing MOP stays cheap for the CLI, GUI and API. Rebinds the
+    module-level functions, which every calculation here looks up at call time;
+    code that imported the names directly keeps the Python versions. Each one
+    compiles on its first call (cache=True reuses the machine code across runs).
+    Results are bitwise identical (no fastmath). Returns False, changing
+    nothing, when Numba is not installed.
+    """
+    global inv_inverse, calculate_improved_helical_correction
+    try:
+        from numba import njit
+    except ImportError:
+        return False
+    if not hasattr(inv_inverse, "py_func"):  # Not compiled yet
+        inv_inverse = njit(cache=True)(inv_inverse)
+        calculate_improved_helical_correction = njit(cache=True)(calculate_improved_helical_correction)
+    return True
+
 def mow_helical_external_dp(z: int, normal_DP: float, normal_alpha_deg: float, t: float, d: float, helix_deg: float = 0.0) -> Result:
     """
     Measurement Over Pins for helical external gears.
@@ -330,7 +398,7 @@ def mow_helical_external_dp(z: int, normal_DP: float, normal_alpha_deg: float, t
     
     # Convert normal tooth thickness to transverse tooth thickness
     # Standard conversion: transverse_thickness = normal_thickness / cos(helix_angle)
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
+    helix_rad = helix_deg * DEG2RAD
     trans_tooth_thickness = t / math.cos(helix_rad)
     
     # Use standard spur gear calculation with transverse parameters
@@ -379,7 +447,7 @@ def mbp_helical_internal_dp(z: int, normal_DP: float, normal_alpha_deg: float, s
     
     # Convert normal space width to transverse space width
     # Standard conversion: transverse_space = normal_space / cos(helix_angle)
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
+    helix_rad = helix_deg * DEG2RAD
     trans_space_width = s / math.cos(helix_rad)
     
     # Use standard spur gear calculation with transverse parameters
@@ -398,6 +466,7 @@ def mbp_helical_internal_dp(z: int, normal_DP: float, normal_alpha_deg: float, s
     return result
 
 # ---------- "Best wire" (rule-of-thumb) ----------
+@lru_cache(maxsize=4096)
 def best_pin_rule(DP: float, alpha_deg: float) -> float:
     """
     Returns an approximate 'best' pin diameter (inches) for external spur gears.
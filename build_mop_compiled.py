@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Build the AOT-compiled MOP kernels (mop_compiled extension module)
+
+Compiles the kernels in mop_kernels.py ahead of time with numba.pycc so the
+API never pays JIT compilation cost at startup or on the first request.
+
+Usage:
+    pip install numba
+    python build_mop_compiled.py
+
+The resulting mop_compiled.*.so / .pyd is picked up automatically by
+gear_api.py; without it the API uses the pure Python MOP.py functions.
+"""
+
+import os
+from numba.pycc import CC
+
+import mop_kernels
+
+# (MOW, Dp, Db, E, inv_alpha, inv_beta, beta_rad, C2, factor)
+SPUR_SIGNATURE = 'UniTuple(f8, 9)(i8, f8, f8, f8, f8)'
+HELICAL_SIGNATURE = 'UniTuple(f8, 9)(i8, f8, f8, f8, f8, f8)'
+
+cc = CC('mop_compiled')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('mow_spur_external_core', SPUR_SIGNATURE)(mop_kernels.mow_spur_external_core.py_func)
+cc.export('mbp_spur_internal_core', SPUR_SIGNATURE)(mop_kernels.mbp_spur_internal_core.py_func)
+cc.export('mow_helical_external_core', HELICAL_SIGNATURE)(mop_kernels.mow_helical_external_core.py_func)
+cc.export('mbp_helical_internal_core', HELICAL_SIGNATURE)(mop_kernels.mbp_helical_internal_core.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built mop_compiled in {cc.output_dir}")
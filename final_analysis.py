@@ -6,6 +6,8 @@ Final analysis to determine the exact helical gear correction formula.
 import math
 from MOP import PI_HIGH_PRECISION
 
+_DEG2RAD = PI_HIGH_PRECISION / 180.0
+
 def final_investigation():
     """Final investigation of the correction formula."""
     
@@ -20,13 +22,16 @@ def final_investigation():
     print("=== Final Helical Gear Correction Analysis ===")
     
     # Calculate angles
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
-    normal_pa_rad = normal_pa_deg * (PI_HIGH_PRECISION / 180.0)
-    trans_pa_rad = math.atan(math.tan(normal_pa_rad) / math.cos(helix_rad))
+    helix_rad = helix_deg * _DEG2RAD
+    normal_pa_rad = normal_pa_deg * _DEG2RAD
+    # Each angle's sin/cos pair is evaluated once and reused below
+    sin_helix, cos_helix = math.sin(helix_rad), math.cos(helix_rad)
+    sin_normal_pa, cos_normal_pa = math.sin(normal_pa_rad), math.cos(normal_pa_rad)
+    trans_pa_rad = math.atan(math.tan(normal_pa_rad) / cos_helix)
     
     # We found that the ratio is approximately 0.759753
     # Let's test if this is a specific fraction
-    base_value = d * math.sin(helix_rad) * math.sin(normal_pa_rad)
+    base_value = d * sin_helix * sin_normal_pa
     ratio = exact_correction / base_value
     
     print(f"Exact correction: {exact_correction:.6f}")
@@ -59,11 +64,6 @@ def final_investigation():
     
     # The ratio 0.759753 might be related to cos(helix) or other gear parameters
     # Let's test more geometric relationships
-    cos_helix = math.cos(helix_rad)
-    sin_helix = math.sin(helix_rad)
-    cos_normal_pa = math.cos(normal_pa_rad)
-    sin_normal_pa = math.sin(normal_pa_rad)
-    
     # Test if the ratio is related to gear geometry
     test_ratios = [
         ("cos(helix) / cos(normal_PA)", cos_helix / cos_normal_pa),
@@ -104,7 +104,7 @@ def final_investigation():
     print(f"correction = (3/4) * d * sin(helix_angle) * sin(normal_PA)")
     
     # Verify with our test case
-    recommended_correction = 0.76 * d * math.sin(helix_rad) * math.sin(normal_pa_rad)
+    recommended_correction = 0.76 * d * sin_helix * sin_normal_pa
     final_error = abs(recommended_correction - exact_correction)
     print(f"\nVerification:")
     print(f"Recommended correction: {recommended_correction:.6f}")
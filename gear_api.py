@@ -12,16 +12,37 @@ Features:
 """
 
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field, validator
+from fastapi.responses import HTMLResponse, Response
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    orjson = None
+    from fastapi.responses import JSONResponse as DefaultResponse
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
+import argparse
+import asyncio
+import bisect
+import importlib.util
+import json
+import logging
+import os
+import sys
 import uvicorn
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 
 # Import our gear calculation modules
 from MOP import mow_helical_external_dp, mbp_helical_internal_dp, mow_spur_external_dp, mbp_spur_internal_dp, best_pin_rule
 from gear_metrology_agent import GearMetrologyAgent, GearParameters
 
+# Optional AOT-compiled kernels (build with: python build_mop_compiled.py)
+try:
+    import mop_compiled
+except ImportError:
+    mop_compiled = None
+
 # Pydantic models for API requests/responses
 class GearCalculationRequest(BaseModel):
     """Request model for gear calculations"""
@@ -35,23 +56,12 @@ class GearCalculationRequest(BaseModel):
     is_metric: bool = Field(False, description="True for module units, False for diametral pitch")
     use_best_pin: bool = Field(False, description="Auto-calculate optimal pin diameter")
 
-    @validator('teeth')
-    def validate_teeth(cls, v):
-        if v < 6:
-            raise ValueError('Minimum tooth count is 6')
-        if v > 500:
-            raise ValueError('Maximum tooth count is 500')
-        return v
-
-    @validator('pressure_angle')
-    def validate_pressure_angle(cls, v):
-        if not 10 <= v <= 45:
-            raise ValueError('Pressure angle must be between 10° and 45°')
-        return v
+    # Bounds are enforced by the Field constraints above (validated in pydantic-core)
+    model_config = ConfigDict(extra='forbid')
 
 class BatchCalculationRequest(BaseModel):
     """Request model for batch calculations"""
-    calculations: List[GearCalculationRequest] = Field(..., max_items=50, description="List of calculations (max 50)")
+    calculations: List[GearCalculationRequest] = Field(..., max_length=50, description="List of calculations (max 50)")
 
 class GearCalculationResult(BaseModel):
     """Response model for gear calculations"""
@@ -87,26 +97,46 @@ class HealthResponse(BaseModel):
     version: str
     features: List[str]
 
+logger = logging.getLogger(__name__)
+
+# Helical coefficient bands: upper bounds (inclusive) and their labels
+_HELIX_BANDS = (8.0, 14.0, 25.0)
+_HELIX_LABELS = ("Low Helix (0-8°)", "Medium Helix (8-14°)", "High Helix (14-25°)", "Very High Helix (25-45°)")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Gear Metrology API",
     description="Precision gear measurement calculations with advanced helical corrections",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=DefaultResponse  # orjson when installed
 )
 
 # Global gear metrology agent instance
 gear_agent: Optional[GearMetrologyAgent] = None
 
+# Process pool for /batch - the gear math is pure CPU, so spreading it across
+# worker processes keeps the event loop free and scales with core count. Each
+# server worker runs its own lifespan, so the cores are split between them
+# (main_prod sets MOP_API_WORKERS) instead of every worker taking all of them.
+_BATCH_POOL: Optional[ProcessPoolExecutor] = None
+
+# Per-process agent used by batch workers (never touched in the server process)
+_worker_agent: Optional[GearMetrologyAgent] = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize and cleanup the gear metrology agent"""
-    global gear_agent
-    gear_agent = GearMetrologyAgent()
-    print("🚀 Gear Metrology API started - Agent initialized")
+    """Initialize and cleanup the gear metrology agent and batch worker pool"""
+    global gear_agent, _BATCH_POOL
+    gear_agent = GearMetrologyAgent(native_kernels=mop_compiled)
+    server_workers = max(1, int(os.getenv("MOP_API_WORKERS", "1")))
+    _BATCH_POOL = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) // server_workers))
+    logger.info("Gear Metrology API started - agent initialized")
     yield
-    print("🛑 Gear Metrology API shutting down")
+    _BATCH_POOL.shutdown(wait=False, cancel_futures=True)
+    _BATCH_POOL = None
+    logger.info("Gear Metrology API shutting down")
 
 app.router.lifespan_context = lifespan
 
@@ -194,8 +224,93 @@ async def health_check():
         ]
     )
 
+def _calculate_sync(request_data: Dict[str, Any], agent: Optional[GearMetrologyAgent] = None,
+                    fast: bool = False):
+    """
+    Run a single gear calculation without touching FastAPI/Pydantic types
+    
+    Safe to execute in a worker process: takes the plain request dict and
+    returns the GearCalculationResult fields (minus input_parameters) together
+    with the agent's CalculationResult so the caller can record history.
+    
+    With fast=True the result is not recorded in the agent history and only the
+    quality rating is assessed instead of the full configuration analysis.
+    """
+    global _worker_agent
+    if agent is None:
+        if _worker_agent is None:
+            # History is recorded by the server process
+            _worker_agent = GearMetrologyAgent(native_kernels=mop_compiled, track_history=False)
+        agent = _worker_agent
+    
+    # Auto-calculate pin diameter if requested
+    pin_diameter = request_data['pin_diameter']
+    if request_data['use_best_pin'] or pin_diameter is None:
+        dp_for_pin = request_data['diametral_pitch']
+        if request_data['is_metric']:
+            dp_for_pin = 25.4 / request_data['diametral_pitch']  # Convert module to DP
+        pin_diameter = best_pin_rule(dp_for_pin, request_data['pressure_angle'])
+    
+    # Create gear parameters for the agent
+    gear_params = GearParameters(
+        teeth=request_data['teeth'],
+        diametral_pitch=request_data['diametral_pitch'],
+        pressure_angle=request_data['pressure_angle'],
+        tooth_thickness=request_data['tooth_thickness'],
+        pin_diameter=pin_diameter,
+        helix_angle=request_data['helix_angle'],
+        is_internal=request_data['is_internal'],
+        is_metric=request_data['is_metric']
+    )
+    
+    if fast:
+        calc_result = agent.calculate_measurement_over_pins(gear_params, record_history=False)
+        quality_rating = agent.assess_measurement_quality(gear_params)
+    else:
+        calc_result = agent.calculate_measurement_over_pins(gear_params)
+        quality_rating = agent.analyze_gear_configuration(gear_params)['quality_assessment']
+    
+    # Determine coefficient set used (bisect_left keeps band upper bounds inclusive)
+    helix_abs = abs(request_data['helix_angle'])
+    coefficient_set = _HELIX_LABELS[bisect.bisect_left(_HELIX_BANDS, helix_abs)] if helix_abs > 0.01 else None
+    
+    result_fields = {
+        "measurement_value": calc_result.measurement_value,
+        "measurement_type": calc_result.measurement_type,
+        "method": calc_result.method,
+        "uncertainty": calc_result.uncertainty,
+        "pitch_diameter": calc_result.pitch_diameter,
+        "base_diameter": calc_result.base_diameter,
+        "contact_angle": calc_result.contact_angle,
+        "helical_correction": calc_result.helical_correction,
+        "coefficient_set": coefficient_set,
+        "quality_rating": quality_rating,
+        "calculation_notes": calc_result.calculation_notes,
+    }
+    return result_fields, calc_result
+
+async def _calculate_core(request: GearCalculationRequest, fast: bool = False,
+                          pool: Optional[ProcessPoolExecutor] = None) -> GearCalculationResult:
+    """
+    Calculation shared by /calculate and /batch
+    
+    Raises ValueError for invalid parameters (endpoints map errors to HTTP
+    responses). With a pool the work runs in a worker process and the result
+    is recorded in the server agent's history so /stats still counts it.
+    """
+    if pool is None:
+        result_fields, _ = _calculate_sync(request.model_dump(), gear_agent, fast)
+    else:
+        loop = asyncio.get_running_loop()
+        result_fields, calc_result = await loop.run_in_executor(pool, _calculate_sync, request.model_dump())
+        gear_agent.record(calc_result)
+    return GearCalculationResult(input_parameters=request, **result_fields)
+
 @app.post("/calculate", response_model=GearCalculationResult)
-async def calculate_gear_measurement(request: GearCalculationRequest):
+async def calculate_gear_measurement(
+    request: GearCalculationRequest,
+    fast: bool = Query(False, description="Skip calculation history and full configuration analysis")
+):
     """
     Calculate measurement over pins (MOP) or measurement between pins (MBP)
     
@@ -204,63 +319,13 @@ async def calculate_gear_measurement(request: GearCalculationRequest):
     - Spur gears (helix_angle = 0) and helical gears (helix_angle ≠ 0)
     - Automatic pin diameter calculation
     - Advanced helical corrections with multi-term formulas
+    - fast=true to bypass history recording (not counted in /stats)
     """
+    if gear_agent is None:
+        raise HTTPException(status_code=500, detail="Gear metrology agent not initialized")
+    
     try:
-        # Auto-calculate pin diameter if requested
-        pin_diameter = request.pin_diameter
-        if request.use_best_pin or pin_diameter is None:
-            dp_for_pin = request.diametral_pitch
-            if request.is_metric:
-                dp_for_pin = 25.4 / request.diametral_pitch  # Convert module to DP
-            pin_diameter = best_pin_rule(dp_for_pin, request.pressure_angle)
-        
-        # Create gear parameters for the agent
-        gear_params = GearParameters(
-            teeth=request.teeth,
-            diametral_pitch=request.diametral_pitch,
-            pressure_angle=request.pressure_angle,
-            tooth_thickness=request.tooth_thickness,
-            pin_diameter=pin_diameter,
-            helix_angle=request.helix_angle,
-            is_internal=request.is_internal,
-            is_metric=request.is_metric
-        )
-        
-        # Use the gear metrology agent for calculation
-        if gear_agent is None:
-            raise HTTPException(status_code=500, detail="Gear metrology agent not initialized")
-        
-        calc_result = gear_agent.calculate_measurement_over_pins(gear_params)
-        analysis = gear_agent.analyze_gear_configuration(gear_params)
-        
-        # Determine coefficient set used
-        coefficient_set = None
-        if abs(request.helix_angle) > 0.01:
-            helix_abs = abs(request.helix_angle)
-            if helix_abs <= 8.0:
-                coefficient_set = "Low Helix (0-8°)"
-            elif helix_abs <= 14.0:
-                coefficient_set = "Medium Helix (8-14°)"
-            elif helix_abs <= 25.0:
-                coefficient_set = "High Helix (14-25°)"
-            else:
-                coefficient_set = "Very High Helix (25-45°)"
-        
-        # Build response
-        return GearCalculationResult(
-            measurement_value=calc_result.measurement_value,
-            measurement_type=calc_result.measurement_type,
-            method=calc_result.method,
-            uncertainty=calc_result.uncertainty,
-            input_parameters=request,
-            pitch_diameter=calc_result.pitch_diameter,
-            base_diameter=calc_result.base_diameter,
-            contact_angle=calc_result.contact_angle,
-            helical_correction=calc_result.helical_correction,
-            coefficient_set=coefficient_set,
-            quality_rating=analysis['quality_assessment'],
-            calculation_notes=calc_result.calculation_notes
-        )
+        return await _calculate_core(request, fast)
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid input parameters: {str(e)}")
@@ -280,17 +345,26 @@ async def batch_calculate(request: BatchCalculationRequest):
     if len(request.calculations) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 calculations per batch")
     
+    if gear_agent is None:
+        raise HTTPException(status_code=500, detail="Gear metrology agent not initialized")
+    
     results = []
     errors = []
     
-    for i, calc_request in enumerate(request.calculations):
-        try:
-            result = await calculate_gear_measurement(calc_request)
-            results.append(result)
-        except HTTPException as e:
-            errors.append(f"Calculation {i+1}: {e.detail}")
-        except Exception as e:
-            errors.append(f"Calculation {i+1}: Unexpected error - {str(e)}")
+    # Fan the calculations out to the worker pool (runs inline if the lifespan
+    # pool has not been started)
+    raw_results = await asyncio.gather(
+        *[_calculate_core(calc_request, pool=_BATCH_POOL) for calc_request in request.calculations],
+        return_exceptions=True
+    )
+    
+    for i, raw in enumerate(raw_results):
+        if isinstance(raw, ValueError):
+            errors.append(f"Calculation {i+1}: Invalid input parameters: {str(raw)}")
+        elif isinstance(raw, Exception):
+            errors.append(f"Calculation {i+1}: Calculation error: {str(raw)}")
+        else:
+            results.append(raw)
     
     # Generate summary
     summary = {
@@ -306,72 +380,77 @@ async def batch_calculate(request: BatchCalculationRequest):
         summary=summary
     )
 
-@app.get("/examples")
-async def get_examples():
-    """Get example API requests for testing"""
-    return {
-        "single_calculation": {
-            "url": "/calculate",
-            "method": "POST",
-            "example_external_spur": {
-                "teeth": 45,
-                "diametral_pitch": 8.0,
-                "pressure_angle": 20.0,
-                "tooth_thickness": 0.1963,
-                "pin_diameter": 0.210,
-                "helix_angle": 0.0,
-                "is_internal": False,
-                "is_metric": False,
-                "use_best_pin": False
-            },
-            "example_external_helical": {
-                "teeth": 127,
-                "diametral_pitch": 12.0,
-                "pressure_angle": 20.0,
-                "tooth_thickness": 0.130900,
-                "helix_angle": 15.0,
-                "is_internal": False,
-                "is_metric": False,
-                "use_best_pin": True
-            },
-            "example_internal_helical": {
-                "teeth": 80,
-                "diametral_pitch": 10.0,
-                "pressure_angle": 20.0,
-                "tooth_thickness": 0.1571,
-                "helix_angle": 10.5,
-                "is_internal": True,
-                "is_metric": False,
-                "use_best_pin": True
-            }
+# Example payloads are static - build them (and their JSON encoding) once at import
+_EXAMPLES = {
+    "single_calculation": {
+        "url": "/calculate",
+        "method": "POST",
+        "example_external_spur": {
+            "teeth": 45,
+            "diametral_pitch": 8.0,
+            "pressure_angle": 20.0,
+            "tooth_thickness": 0.1963,
+            "pin_diameter": 0.210,
+            "helix_angle": 0.0,
+            "is_internal": False,
+            "is_metric": False,
+            "use_best_pin": False
         },
-        "batch_calculation": {
-            "url": "/batch",
-            "method": "POST",
-            "example": {
-                "calculations": [
-                    {
-                        "teeth": 45,
-                        "diametral_pitch": 8.0,
-                        "pressure_angle": 20.0,
-                        "tooth_thickness": 0.1963,
-                        "helix_angle": 0.0,
-                        "is_internal": False,
-                        "use_best_pin": True
-                    },
-                    {
-                        "teeth": 127,
-                        "diametral_pitch": 12.0,
-                        "pressure_angle": 20.0,
-                        "tooth_thickness": 0.130900,
-                        "helix_angle": 15.0,
-                        "is_internal": False,
-                        "use_best_pin": True
-                    }
-                ]
-            }
+        "example_external_helical": {
+            "teeth": 127,
+            "diametral_pitch": 12.0,
+            "pressure_angle": 20.0,
+            "tooth_thickness": 0.130900,
+            "helix_angle": 15.0,
+            "is_internal": False,
+            "is_metric": False,
+            "use_best_pin": True
+        },
+        "example_internal_helical": {
+            "teeth": 80,
+            "diametral_pitch": 10.0,
+            "pressure_angle": 20.0,
+            "tooth_thickness": 0.1571,
+            "helix_angle": 10.5,
+            "is_internal": True,
+            "is_metric": False,
+            "use_best_pin": True
+        }
+    },
+    "batch_calculation": {
+        "url": "/batch",
+        "method": "POST",
+        "example": {
+            "calculations": [
+                {
+                    "teeth": 45,
+                    "diametral_pitch": 8.0,
+                    "pressure_angle": 20.0,
+                    "tooth_thickness": 0.1963,
+                    "helix_angle": 0.0,
+                    "is_internal": False,
+                    "use_best_pin": True
+                },
+                {
+                    "teeth": 127,
+                    "diametral_pitch": 12.0,
+                    "pressure_angle": 20.0,
+                    "tooth_thickness": 0.130900,
+                    "helix_angle": 15.0,
+                    "is_internal": False,
+                    "use_best_pin": True
+                }
+            ]
         }
     }
+}
+
+_EXAMPLES_BYTES = orjson.dumps(_EXAMPLES) if orjson is not None else json.dumps(_EXAMPLES).encode()
+
+@app.get("/examples")
+async def get_examples():
+    """Get example API requests for testing"""
+    return Response(content=_EXAMPLES_BYTES, media_type="application/json")
 
 @app.get("/stats")
 async def get_calculation_stats():
@@ -384,11 +463,18 @@ async def get_calculation_stats():
     if not history:
         return {"message": "No calculations performed yet"}
     
-    # Analyze calculation history
+    # Analyze calculation history in a single pass
     total_calcs = len(history)
-    external_count = sum(1 for h in history if h.measurement_type == "MOP")
-    internal_count = sum(1 for h in history if h.measurement_type == "MBP")
-    helical_count = sum(1 for h in history if abs(h.gear_parameters.helix_angle) > 0.01)
+    external_count = internal_count = helical_count = 0
+    uncertainty_sum = 0.0
+    for h in history:
+        if h.measurement_type == "MOP":
+            external_count += 1
+        elif h.measurement_type == "MBP":
+            internal_count += 1
+        if abs(h.gear_parameters.helix_angle) > 0.01:
+            helical_count += 1
+        uncertainty_sum += h.uncertainty
     
     return {
         "total_calculations": total_calcs,
@@ -396,24 +482,62 @@ async def get_calculation_stats():
         "internal_gears": internal_count,
         "helical_gears": helical_count,
         "spur_gears": total_calcs - helical_count,
-        "average_uncertainty": sum(h.uncertainty for h in history) / total_calcs if total_calcs > 0 else 0
+        "average_uncertainty": uncertainty_sum / total_calcs
     }
 
-# Development server runner
-def main():
-    """Run the development server"""
-    print("🚀 Starting Gear Metrology API...")
-    print("📖 API Documentation: http://localhost:8000/docs")
-    print("🔍 Alternative Docs: http://localhost:8000/redoc")
-    print("🏠 Home Page: http://localhost:8000/")
+# Server runners
+def main_dev(host: str = "127.0.0.1", port: int = 8000):
+    """Run the development server (auto-reload, single worker)"""
+    if sys.stdout.isatty():
+        print("🚀 Starting Gear Metrology API...\n"
+              f"📖 API Documentation: http://localhost:{port}/docs\n"
+              f"🔍 Alternative Docs: http://localhost:{port}/redoc\n"
+              f"🏠 Home Page: http://localhost:{port}/")
     
     uvicorn.run(
         "gear_api:app",
-        host="127.0.0.1",
-        port=8000,
+        host=host,
+        port=port,
         reload=True,
         log_level="info"
     )
 
+def main_prod(host: str = "127.0.0.1", port: int = 8000):
+    """
+    Run the production server (no reload, one worker per core, uvloop/httptools when installed)
+    
+    Every worker is a separate process with its own agent, so /stats and the
+    calculation history only cover the requests that worker served. The
+    worker count is exported so each worker's /batch pool gets its share of
+    the cores rather than one process per core.
+    """
+    workers = os.cpu_count() or 1
+    os.environ["MOP_API_WORKERS"] = str(workers)
+    uvicorn.run(
+        "gear_api:app",
+        host=host,
+        port=port,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        http="httptools" if importlib.util.find_spec("httptools") else "auto",
+        workers=workers,
+        reload=False,
+        access_log=False,
+        timeout_keep_alive=30,  # Keep HTTP/1.1 connections open between client requests
+        log_level="info"
+    )
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Gear Metrology API server")
+    parser.add_argument("--prod", action="store_true", help="Run production server (multi-worker, no reload)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    args = parser.parse_args()
+    
+    if args.prod:
+        main_prod(args.host, args.port)
+    else:
+        main_dev(args.host, args.port)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,10 +6,101 @@ High-precision gear calculations with accuracy ≤0.00005"
 """
 
 import json
+import os
 import sys
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict
-from gear_metrology_agent import GearMetrologyAgent, GearParameters
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Union
+from dataclasses import dataclass, fields, replace
+from gear_metrology_agent import GearMetrologyAgent, GearParameters, mop_batch
+from MOP import best_pin_rule
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+# Batches smaller than this run inline - process pool startup would cost more than it saves
+PARALLEL_BATCH_THRESHOLD = 8
+
+# Gears per NumPy kernel call when streaming a vectorized batch (iter_batch)
+VECTOR_CHUNK_SIZE = 4096
+
+# validate_parameters tables, built once
+_REQUIRED_PARAMETERS = ('teeth', 'diametral_pitch', 'pressure_angle', 'tooth_thickness')
+_REQUIRED_PARAMETERS_SET = frozenset(_REQUIRED_PARAMETERS)
+_PARAMETER_RANGES = (
+    ('teeth', 6, 500, int),
+    ('diametral_pitch', 0.1, 100, float),
+    ('pressure_angle', 10, 45, float),
+    ('tooth_thickness', 0.001, 10, float),
+    ('helix_angle', -45, 45, float)
+)
+
+@dataclass(slots=True)
+class MeasurementGeometry:
+    """Derived geometry block of a calculation response"""
+    pitch_diameter: float
+    base_diameter: float
+    contact_angle: float
+
+@dataclass(slots=True)
+class CalcResponse:
+    """
+    Successful calculation response as a slotted record
+    
+    Serializes (orjson natively, or to_dict()) to the same JSON object as the
+    dictionaries returned by calculate_single, without building nested dicts.
+    """
+    success: bool
+    measurement_value: float
+    measurement_type: str
+    method: str
+    uncertainty: float
+    meets_precision_target: bool
+    helical_correction: float
+    quality_rating: str
+    calculation_notes: List[str]
+    geometry: MeasurementGeometry
+    input_parameters: GearParameters
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Response dictionary (the calculate_single format)"""
+        return _record_to_dict(self)
+
+def _record_to_dict(obj: Any) -> Any:
+    """Convert slotted dataclass records (recursively) to dictionaries"""
+    return {f.name: _record_to_dict(getattr(obj, f.name)) for f in fields(obj)} if hasattr(obj, '__dataclass_fields__') else obj
+
+def _dumps(obj: Any) -> str:
+    """Serialize a response for output (orjson when installed, one call per payload)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, indent=2)
+
+def _dumps_line(obj: Any) -> str:
+    """Serialize one record as a compact JSON line (NDJSON)"""
+    if orjson is not None:
+        # Serializes CalcResponse records natively (dataclass support)
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE).decode()
+    return json.dumps(_record_to_dict(obj)) + '\n'
+
+# Agent shared by every GearCliAPI that records history (the calculation path
+# only reads module-level tables, so sharing it across threads is safe)
+_DEFAULT_AGENT = GearMetrologyAgent()
+
+# Per-process API instance for batch workers (set by _init_batch_worker)
+_API: Optional["GearCliAPI"] = None
+
+def _init_batch_worker():
+    """Process pool initializer: build one API instance per worker"""
+    global _API
+    _API = GearCliAPI(track_history=False)
+
+def _calc_one(parameters: Dict[str, Any], include_analysis: bool = True,
+              as_record: bool = False) -> Union[Dict[str, Any], CalcResponse]:
+    """Calculate a single gear in a batch worker process"""
+    return _API.calculate_single(parameters, include_analysis, as_record)
 
 class GearCliAPI:
     """
@@ -17,98 +108,205 @@ class GearCliAPI:
     No web browser required - pure Python interface
     """
     
-    def __init__(self):
-        self.agent = GearMetrologyAgent()
+    def __init__(self, track_history: bool = True, agent: Optional[GearMetrologyAgent] = None):
+        if agent is None:
+            agent = _DEFAULT_AGENT if track_history else GearMetrologyAgent(track_history=False)
+        self.agent = agent
         self.precision_target = 0.00005  # 0.05 thou maximum error
         
-    def calculate_single(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def calculate_single(self, parameters: Dict[str, Any], include_analysis: bool = True,
+                         as_record: bool = False) -> Union[Dict[str, Any], CalcResponse]:
         """
         Calculate single gear measurement
         
         Args:
             parameters: Dictionary with gear parameters
+            include_analysis: Run analyze_gear_configuration for the quality rating;
+                when False the rating is reported as 'unrated'
+            as_record: Return a successful result as a CalcResponse record
+                (errors are always dictionaries)
             
         Returns:
             Dictionary with calculation results
         """
         try:
-            # Validate and create gear parameters
-            gear_params = GearParameters(
-                teeth=int(parameters['teeth']),
-                diametral_pitch=float(parameters['diametral_pitch']),
-                pressure_angle=float(parameters['pressure_angle']),
-                tooth_thickness=float(parameters['tooth_thickness']),
-                pin_diameter=float(parameters.get('pin_diameter', 0)),
-                helix_angle=float(parameters.get('helix_angle', 0.0)),
-                is_internal=bool(parameters.get('is_internal', False)),
-                is_metric=bool(parameters.get('is_metric', False))
-            )
-            
-            # Auto-calculate pin if needed
-            if gear_params.pin_diameter <= 0 or parameters.get('use_best_pin', False):
-                from MOP import best_pin_rule
-                dp_for_pin = gear_params.diametral_pitch
-                if gear_params.is_metric:
-                    dp_for_pin = 25.4 / gear_params.diametral_pitch
-                gear_params.pin_diameter = best_pin_rule(dp_for_pin, gear_params.pressure_angle)
+            gear_params = self._build_gear_parameters(parameters)
             
             # Calculate with high precision
             result = self.agent.calculate_measurement_over_pins(gear_params)
-            analysis = self.agent.analyze_gear_configuration(gear_params)
+            analysis = self.agent.analyze_gear_configuration(gear_params) if include_analysis else None
             
-            # Check precision requirement
-            if result.uncertainty > self.precision_target:
-                # Apply additional precision enhancement if needed
-                result = self._enhance_precision(gear_params, result)
-            
-            # Format response
-            return {
-                'success': True,
-                'measurement_value': result.measurement_value,
-                'measurement_type': result.measurement_type,
-                'method': result.method,
-                'uncertainty': result.uncertainty,
-                'meets_precision_target': result.uncertainty <= self.precision_target,
-                'helical_correction': result.helical_correction,
-                'quality_rating': analysis['quality_assessment'],
-                'calculation_notes': result.calculation_notes,
-                'geometry': {
-                    'pitch_diameter': result.pitch_diameter,
-                    'base_diameter': result.base_diameter,
-                    'contact_angle': result.contact_angle
-                },
-                'input_parameters': asdict(gear_params)
-            }
+            return self._format_result(gear_params, result, analysis, as_record)
             
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'error_type': type(e).__name__
+            return self._format_error(e)
+    
+    def _build_gear_parameters(self, parameters: Dict[str, Any]) -> GearParameters:
+        """Validate a parameter dictionary and create GearParameters (auto-sizing the pin if needed)"""
+        gear_params = GearParameters(
+            teeth=int(parameters['teeth']),
+            diametral_pitch=float(parameters['diametral_pitch']),
+            pressure_angle=float(parameters['pressure_angle']),
+            tooth_thickness=float(parameters['tooth_thickness']),
+            pin_diameter=float(parameters.get('pin_diameter', 0)),
+            helix_angle=float(parameters.get('helix_angle', 0.0)),
+            is_internal=bool(parameters.get('is_internal', False)),
+            is_metric=bool(parameters.get('is_metric', False))
+        )
+        
+        # Auto-calculate pin if needed
+        if gear_params.pin_diameter <= 0 or parameters.get('use_best_pin', False):
+            dp_for_pin = gear_params.diametral_pitch
+            if gear_params.is_metric:
+                dp_for_pin = 25.4 / gear_params.diametral_pitch
+            # GearParameters is frozen - derive a copy with the pin filled in
+            gear_params = replace(gear_params, pin_diameter=best_pin_rule(dp_for_pin, gear_params.pressure_angle))
+        
+        return gear_params
+    
+    def _format_result(self, gear_params: GearParameters, result, analysis: Optional[Dict[str, Any]],
+                       as_record: bool = False) -> Union[Dict[str, Any], CalcResponse]:
+        """Format a calculation result as a response dictionary (or CalcResponse record)"""
+        # Check precision requirement
+        if result.uncertainty > self.precision_target:
+            # Apply additional precision enhancement if needed
+            result = self._enhance_precision(gear_params, result)
+        
+        if as_record:
+            return CalcResponse(
+                True, result.measurement_value, result.measurement_type, result.method,
+                result.uncertainty, result.uncertainty <= self.precision_target,
+                result.helical_correction,
+                analysis['quality_assessment'] if analysis is not None else 'unrated',
+                result.calculation_notes,
+                MeasurementGeometry(result.pitch_diameter, result.base_diameter, result.contact_angle),
+                gear_params
+            )
+        
+        return {
+            'success': True,
+            'measurement_value': result.measurement_value,
+            'measurement_type': result.measurement_type,
+            'method': result.method,
+            'uncertainty': result.uncertainty,
+            'meets_precision_target': result.uncertainty <= self.precision_target,
+            'helical_correction': result.helical_correction,
+            'quality_rating': analysis['quality_assessment'] if analysis is not None else 'unrated',
+            'calculation_notes': result.calculation_notes,
+            'geometry': {
+                'pitch_diameter': result.pitch_diameter,
+                'base_diameter': result.base_diameter,
+                'contact_angle': result.contact_angle
+            },
+            # Flat dataclass - build the dict directly (asdict deep-copies every field)
+            'input_parameters': {
+                'teeth': gear_params.teeth,
+                'diametral_pitch': gear_params.diametral_pitch,
+                'pressure_angle': gear_params.pressure_angle,
+                'tooth_thickness': gear_params.tooth_thickness,
+                'pin_diameter': gear_params.pin_diameter,
+                'helix_angle': gear_params.helix_angle,
+                'is_internal': gear_params.is_internal,
+                'is_metric': gear_params.is_metric
             }
+        }
+    
+    @staticmethod
+    def _format_error(e: Exception) -> Dict[str, Any]:
+        """Format a failed calculation as a response dictionary"""
+        return {
+            'success': False,
+            'error': str(e),
+            'error_type': type(e).__name__
+        }
     
-    def calculate_batch(self, parameters_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_vectorized(self, parameters_list: List[Dict[str, Any]], include_analysis: bool = True,
+                              as_record: bool = False) -> List[Union[Dict[str, Any], CalcResponse]]:
+        """
+        Calculate a batch through the agent's NumPy kernel (one call for all gears)
+        
+        Entries that fail validation, or whose thickness/pin would make the scalar
+        functions raise, go through calculate_single so their errors read the same.
+        """
+        single_results: List[Optional[Dict[str, Any]]] = [None] * len(parameters_list)
+        batch_index = []
+        batch_params = []
+        
+        for i, parameters in enumerate(parameters_list):
+            try:
+                gear_params = self._build_gear_parameters(parameters)
+            except Exception as e:
+                single_results[i] = self._format_error(e)
+                continue
+            if gear_params.tooth_thickness > 0 and gear_params.pin_diameter > 0:
+                batch_index.append(i)
+                batch_params.append(gear_params)
+            else:
+                single_results[i] = self.calculate_single(parameters, include_analysis, as_record)
+        
+        if batch_params:
+            batch_results = self.agent.calculate_measurements_batch(batch_params)
+            for i, gear_params, result in zip(batch_index, batch_params, batch_results):
+                analysis = self.agent.analyze_gear_configuration(gear_params) if include_analysis else None
+                single_results[i] = self._format_result(gear_params, result, analysis, as_record)
+        
+        return single_results
+    
+    def iter_batch(self, parameters_list: List[Dict[str, Any]], parallel: bool = True,
+                   vectorized: bool = True, include_analysis: bool = False,
+                   as_record: bool = False) -> Iterator[Union[Dict[str, Any], CalcResponse]]:
+        """
+        Calculate multiple gears, yielding each result (in input order) as it is ready
+        
+        Args: as for calculate_batch, plus as_record (see calculate_single). The
+        vectorized path works through the list VECTOR_CHUNK_SIZE gears at a time
+        so results start flowing before the whole batch is done.
+        
+        Yields:
+            calculate_single-style results (success or error)
+        """
+        if vectorized and mop_batch is not None:
+            for start in range(0, len(parameters_list), VECTOR_CHUNK_SIZE):
+                yield from self._calculate_vectorized(
+                    parameters_list[start:start + VECTOR_CHUNK_SIZE], include_analysis, as_record)
+        elif parallel and len(parameters_list) >= PARALLEL_BATCH_THRESHOLD:
+            workers = os.cpu_count() or 1
+            chunksize = max(1, len(parameters_list) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+                # map() yields in submission order, so result numbering is preserved
+                yield from executor.map(_calc_one, parameters_list, repeat(include_analysis),
+                                        repeat(as_record), chunksize=chunksize)
+        else:
+            for params in parameters_list:
+                yield self.calculate_single(params, include_analysis, as_record)
+    
+    def calculate_batch(self, parameters_list: List[Dict[str, Any]], parallel: bool = True,
+                        vectorized: bool = True, include_analysis: bool = False) -> Dict[str, Any]:
         """
         Calculate multiple gears in batch
         
         Args:
             parameters_list: List of parameter dictionaries
+            parallel: Spread the calculations over a process pool (one worker per
+                core) when the batch has at least PARALLEL_BATCH_THRESHOLD entries
+            vectorized: Evaluate the whole batch with the NumPy kernel (mop_batch.py)
+                when NumPy is installed; takes precedence over parallel
+            include_analysis: Run the per-gear configuration analysis (quality rating);
+                off by default since it costs more than the measurement itself
             
         Returns:
             Dictionary with batch results
         """
         results = []
         errors = []
+        precision_ok = 0
         
-        for i, params in enumerate(parameters_list):
-            try:
-                result = self.calculate_single(params)
-                if result['success']:
-                    results.append(result)
-                else:
-                    errors.append(f"Calculation {i+1}: {result['error']}")
-            except Exception as e:
-                errors.append(f"Calculation {i+1}: {str(e)}")
+        for i, result in enumerate(self.iter_batch(parameters_list, parallel, vectorized, include_analysis)):
+            if result['success']:
+                results.append(result)
+                precision_ok += result['meets_precision_target']
+            else:
+                errors.append(f"Calculation {i+1}: {result['error']}")
         
         return {
             'success': len(errors) == 0,
@@ -119,7 +317,7 @@ class GearCliAPI:
                 'failed': len(errors),
                 'success_rate': len(results) / len(parameters_list) * 100 if parameters_list else 0,
                 'errors': errors if errors else None,
-                'precision_compliance': sum(1 for r in results if r['meets_precision_target']) / len(results) * 100 if results else 0
+                'precision_compliance': precision_ok / len(results) * 100 if results else 0
             }
         }
     
@@ -136,39 +334,32 @@ class GearCliAPI:
         Validate gear parameters without calculating
         """
         try:
-            # Required parameters
-            required = ['teeth', 'diametral_pitch', 'pressure_angle', 'tooth_thickness']
-            missing = [param for param in required if param not in parameters]
+            # Required parameters (set difference; ordered only to build the error message)
+            missing = _REQUIRED_PARAMETERS_SET.difference(parameters)
             
             if missing:
                 return {
                     'valid': False,
-                    'error': f"Missing required parameters: {', '.join(missing)}"
+                    'error': f"Missing required parameters: {', '.join(p for p in _REQUIRED_PARAMETERS if p in missing)}"
                 }
             
             # Range validation
-            validations = [
-                ('teeth', 6, 500, int),
-                ('diametral_pitch', 0.1, 100, float),
-                ('pressure_angle', 10, 45, float),
-                ('tooth_thickness', 0.001, 10, float),
-                ('helix_angle', -45, 45, float)
-            ]
-            
-            for param, min_val, max_val, param_type in validations:
-                if param in parameters:
-                    try:
-                        value = param_type(parameters[param])
-                        if not min_val <= value <= max_val:
-                            return {
-                                'valid': False,
-                                'error': f"{param} must be between {min_val} and {max_val}"
-                            }
-                    except (ValueError, TypeError):
-                        return {
-                            'valid': False,
-                            'error': f"{param} must be a valid {param_type.__name__}"
-                        }
+            for param, min_val, max_val, param_type in _PARAMETER_RANGES:
+                value = parameters.get(param)
+                if value is None and param not in parameters:
+                    continue
+                try:
+                    value = param_type(value)
+                except (ValueError, TypeError):
+                    return {
+                        'valid': False,
+                        'error': f"{param} must be a valid {param_type.__name__}"
+                    }
+                if not min_val <= value <= max_val:
+                    return {
+                        'valid': False,
+                        'error': f"{param} must be between {min_val} and {max_val}"
+                    }
             
             return {'valid': True}
             
@@ -181,7 +372,7 @@ def main():
         print("Gear Metrology Command Line API")
         print("Usage:")
         print("  python gear_cli_api.py calculate '{json_parameters}'")
-        print("  python gear_cli_api.py batch '{json_array}'")
+        print("  python gear_cli_api.py batch '{json_array}'     (JSON lines when piped)")
         print("  python gear_cli_api.py validate '{json_parameters}'")
         print()
         print("Example:")
@@ -195,17 +386,24 @@ def main():
         if command == "calculate":
             params = json.loads(sys.argv[2])
             result = api.calculate_single(params)
-            print(json.dumps(result, indent=2))
+            print(_dumps(result))
             
         elif command == "batch":
             params_list = json.loads(sys.argv[2])
-            result = api.calculate_batch(params_list)
-            print(json.dumps(result, indent=2))
+            if sys.stdout.isatty():
+                result = api.calculate_batch(params_list)
+                print(_dumps(result))
+            else:
+                # Piped output: stream one JSON line per gear instead of buffering the batch;
+                # records go straight to the serializer without intermediate dicts
+                write = sys.stdout.write
+                for result in api.iter_batch(params_list, as_record=True):
+                    write(_dumps_line(result))
             
         elif command == "validate":
             params = json.loads(sys.argv[2])
             result = api.validate_parameters(params)
-            print(json.dumps(result, indent=2))
+            print(_dumps(result))
             
         else:
             print(f"Unknown command: {command}")
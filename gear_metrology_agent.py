@@ -12,14 +12,50 @@ This agent provides expert-level gear metrology capabilities with:
 """
 
 import math
-from typing import Dict, List, Tuple, Any, Optional
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, NamedTuple, Tuple, Any, Optional
 from dataclasses import dataclass, field
-from MOP import mow_helical_external_dp, mbp_helical_internal_dp, mow_spur_external_dp, mbp_spur_internal_dp
+from MOP import mow_helical_external_dp, mbp_helical_internal_dp, mow_spur_external_dp, mbp_spur_internal_dp, Result
+
+try:
+    import mop_batch
+except ImportError:  # NumPy not installed - batch calls fall back to the scalar path
+    mop_batch = None
 
 # High-precision mathematical constants
 PI = 3.1415926535897932384626433832795028841971693993751
+_RAD2DEG = 180.0 / PI
+
+# Fused multiply-add (Python 3.13+): one rounding instead of two
+try:
+    from math import fma as _fma
+except ImportError:
+    def _fma(x: float, y: float, z: float) -> float:
+        return x * y + z
 
-@dataclass
+# Gear standards database, built once per process. Pressure angles are frozensets
+# so the compliance checks are hash lookups.
+_AGMA_PRESSURE_ANGLES = frozenset({14.5, 17.5, 20.0, 22.5, 25.0})
+_STANDARDS_DB: Dict[str, Dict] = {
+    'AGMA': {
+        'pressure_angles': _AGMA_PRESSURE_ANGLES,
+        'quality_grades': range(4, 16),
+        'standard_addendum': 1.0,  # in DP units
+    },
+    'ISO': {
+        'pressure_angles': frozenset({15.0, 20.0, 25.0}),
+        'quality_grades': range(1, 13),
+        'standard_addendum': 1.0,  # in module units
+    },
+    'DIN': {
+        'pressure_angles': frozenset({15.0, 20.0, 25.0, 30.0}),
+        'quality_grades': range(1, 13),
+        'standard_addendum': 1.0,
+    }
+}
+
+@dataclass(slots=True, frozen=True)
 class GearParameters:
     """Standard gear parameters for metrology calculations"""
     teeth: int
@@ -42,7 +78,7 @@ class GearParameters:
         if abs(self.helix_angle) > 45:
             raise ValueError("Helix angle must be between -45° and +45°")
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CalculationResult:
     """Comprehensive calculation result with diagnostics"""
     measurement_value: float  # MOP or MBP result
@@ -67,6 +103,102 @@ class CalculationResult:
         return (f"{self.measurement_type}: {self.measurement_value:.6f} in "
                f"(±{self.uncertainty:.6f}) using {self.method} method")
 
+class _DerivedValues(NamedTuple):
+    """Per-gear quantities shared by the uncertainty, notes and analysis helpers"""
+    optimal_pin: float  # 1.68 / DP
+    pin_ratio: float    # pin diameter / optimal pin
+    abs_helix: float    # |helix angle| [degrees]
+
+def _derive(params: GearParameters) -> _DerivedValues:
+    """Compute the shared per-gear quantities once (GearParameters guarantees DP > 0)"""
+    optimal_pin = 1.68 / params.diametral_pitch
+    return _DerivedValues(optimal_pin, params.pin_diameter / optimal_pin, abs(params.helix_angle))
+
+# Note/recommendation templates (%-formatted; built once, not per call)
+_HIGH_HELIX_NOTE = "High helix angle (%.1f°) - verify measurement setup"
+_MEDIUM_HELIX_NOTE = "Medium helix angle (%.1f°) - multi-term correction applied"
+_LOW_HELIX_NOTE = "Low helix angle (%.1f°) - enhanced correction applied"
+_PIN_DIAMETER_NOTE = "Pin diameter (%.4f) differs from optimal (%.4f)"
+_PRESSURE_ANGLE_NOTE = "Non-standard pressure angle (%.1f°)"
+_LARGER_PIN_RECOMMENDATION = "Consider larger pin diameter (current: %.4f, optimal: %.4f)"
+_SMALLER_PIN_RECOMMENDATION = "Consider smaller pin diameter (current: %.4f, optimal: %.4f)"
+
+# Configuration analysis helpers. Batches typically repeat a handful of
+# (DP, pressure angle, pin) setups, so results are cached on their scalar inputs.
+# Cached values are immutable; the agent methods hand out fresh dict/list copies.
+@lru_cache(maxsize=1024)
+def _standards_compliance(pressure_angle: float, geometry_ok: bool) -> Tuple[Tuple[str, bool], ...]:
+    """(standard, compliant) pairs for the module standards database"""
+    return tuple(
+        (standard, geometry_ok and pressure_angle in specs['pressure_angles'])
+        for standard, specs in _STANDARDS_DB.items()
+    )
+
+@lru_cache(maxsize=1024)
+def _recommendations(pin_diameter: float, teeth: int, derived: _DerivedValues) -> Tuple[str, ...]:
+    """Measurement recommendations for one gear setup"""
+    recommendations = []
+    
+    # Pin size recommendation
+    if derived.pin_ratio < 0.9:
+        recommendations.append(_LARGER_PIN_RECOMMENDATION % (pin_diameter, derived.optimal_pin))
+    elif derived.pin_ratio > 1.1:
+        recommendations.append(_SMALLER_PIN_RECOMMENDATION % (pin_diameter, derived.optimal_pin))
+    
+    # Helix angle considerations
+    if derived.abs_helix > 30:
+        recommendations.append("High helix angle may require specialized measurement techniques")
+    
+    # Tooth count considerations
+    if teeth < 17:
+        recommendations.append("Low tooth count - consider measurement repeatability testing")
+    elif teeth > 200:
+        recommendations.append("High tooth count - verify pin positioning accuracy")
+    
+    return tuple(recommendations)
+
+@lru_cache(maxsize=1024)
+def _measurement_quality(abs_helix: float, teeth: int, pin_ratio: float) -> str:
+    """Expected measurement quality rating"""
+    quality_score = 100
+    
+    # Deduct for non-optimal conditions
+    if abs_helix > 25:
+        quality_score -= 15
+    elif abs_helix > 15:
+        quality_score -= 5
+    
+    if teeth < 17:
+        quality_score -= 10
+    elif teeth > 200:
+        quality_score -= 5
+    
+    if abs(pin_ratio - 1.0) > 0.2:
+        quality_score -= 10
+    
+    if quality_score >= 90:
+        return "Excellent"
+    elif quality_score >= 80:
+        return "Good" 
+    elif quality_score >= 70:
+        return "Fair"
+    else:
+        return "Poor - Review measurement setup"
+
+def _wrap_native_kernel(kernel):
+    """Adapt a tuple-returning compiled kernel (see mop_kernels.py) to the MOP.py call signature"""
+    def calculate(z, *args):
+        # Fixed argument types keep JIT kernels on their single compiled signature
+        MOW, Dp, Db, E, inv_alpha, inv_beta, beta, C2, factor = kernel(int(z), *[float(a) for a in args])
+        return Result(
+            method="2-pin" if z % 2 == 0 else "odd tooth", MOW=MOW,
+            Dp=Dp, Db=Db, E=E,
+            inv_alpha=inv_alpha, inv_beta=inv_beta,
+            beta_rad=beta, beta_deg=beta * _RAD2DEG,
+            C2=C2, factor=factor
+        )
+    return calculate
+
 class GearMetrologyAgent:
     """
     Specialized agent for precision gear metrology calculations
@@ -79,36 +211,60 @@ class GearMetrologyAgent:
     - Comprehensive error analysis and reporting
     """
     
-    def __init__(self):
+    def __init__(self, max_history: int = 1000, native_kernels=None, track_history: bool = True,
+                 jit_kernels: bool = False):
+        """
+        Args:
+            max_history: Maximum number of results kept in calculation_history
+                (ring buffer - the oldest results are dropped)
+            track_history: Record results in calculation_history at all; worker
+                agents whose history nobody reads can switch it off
+            native_kernels: Optional compiled kernel module (e.g. mop_compiled from
+                build_mop_compiled.py) used instead of the pure Python MOP.py functions.
+            jit_kernels: Use the Numba JIT kernels in mop_kernels.py when no
+                native_kernels are given. Each kernel compiles on its first call
+                (cache=True reuses the machine code across runs); ignored when
+                Numba is not installed.
+        """
+        if native_kernels is None and jit_kernels:
+            import mop_kernels
+            if mop_kernels.NUMBA_AVAILABLE:
+                native_kernels = mop_kernels
         self.version = "1.0.0"
-        self.calculation_history: List[CalculationResult] = []
+        # Bounded so long-running services (gear_api) don't grow without limit
+        self.calculation_history: Deque[CalculationResult] = deque(maxlen=max_history)
+        self.track_history = track_history
         self.standards_database = self._load_standards_database()
         self.precision_tracker = PrecisionTracker()
+        
+        # Calculation kernels (MOP.py reference implementation by default)
+        self._mow_spur_external = mow_spur_external_dp
+        self._mbp_spur_internal = mbp_spur_internal_dp
+        self._mow_helical_external = mow_helical_external_dp
+        self._mbp_helical_internal = mbp_helical_internal_dp
+        if native_kernels is not None:
+            self._mow_spur_external = _wrap_native_kernel(native_kernels.mow_spur_external_core)
+            self._mbp_spur_internal = _wrap_native_kernel(native_kernels.mbp_spur_internal_core)
+            self._mow_helical_external = _wrap_native_kernel(native_kernels.mow_helical_external_core)
+            self._mbp_helical_internal = _wrap_native_kernel(native_kernels.mbp_helical_internal_core)
     
     def _load_standards_database(self) -> Dict[str, Dict]:
-        """Load gear standards database"""
-        return {
-            'AGMA': {
-                'pressure_angles': [14.5, 17.5, 20.0, 22.5, 25.0],
-                'quality_grades': range(4, 16),
-                'standard_addendum': 1.0,  # in DP units
-            },
-            'ISO': {
-                'pressure_angles': [15.0, 20.0, 25.0],
-                'quality_grades': range(1, 13),
-                'standard_addendum': 1.0,  # in module units
-            },
-            'DIN': {
-                'pressure_angles': [15.0, 20.0, 25.0, 30.0],
-                'quality_grades': range(1, 13),
-                'standard_addendum': 1.0,
-            }
-        }
+        """Load gear standards database (shared module-level table, not copied)"""
+        return _STANDARDS_DB
     
-    def calculate_measurement_over_pins(self, params: GearParameters) -> CalculationResult:
+    def calculate_measurement_over_pins(self, params: GearParameters, record_history: bool = True,
+                                        history: Optional[Deque[CalculationResult]] = None) -> CalculationResult:
         """
         Calculate measurement over pins with comprehensive analysis
         
+        The calculation only reads shared state, so one agent can serve many
+        threads; the history append is a single deque operation.
+        
+        Args:
+            params: Gear parameters
+            record_history: Append the result to calculation_history
+            history: Record into this deque/list instead of the agent's own history
+        
         Returns:
             CalculationResult: Complete result with diagnostics and uncertainty
         """
@@ -122,13 +278,13 @@ class GearMetrologyAgent:
             # Perform calculation based on gear type
             if params.is_internal:
                 if abs(params.helix_angle) > 0.01:
-                    result = mbp_helical_internal_dp(
+                    result = self._mbp_helical_internal(
                         params.teeth, dp_equivalent, params.pressure_angle,
                         params.tooth_thickness, params.pin_diameter, params.helix_angle
                     )
                     calc_method = "helical_internal"
                 else:
-                    result = mbp_spur_internal_dp(
+                    result = self._mbp_spur_internal(
                         params.teeth, dp_equivalent, params.pressure_angle,
                         params.tooth_thickness, params.pin_diameter
                     )
@@ -136,13 +292,13 @@ class GearMetrologyAgent:
                 measurement_type = "MBP"
             else:  # External gear
                 if abs(params.helix_angle) > 0.01:
-                    result = mow_helical_external_dp(
+                    result = self._mow_helical_external(
                         params.teeth, dp_equivalent, params.pressure_angle,
                         params.tooth_thickness, params.pin_diameter, params.helix_angle
                     )
                     calc_method = "helical_external"
                 else:
-                    result = mow_spur_external_dp(
+                    result = self._mow_spur_external(
                         params.teeth, dp_equivalent, params.pressure_angle,
                         params.tooth_thickness, params.pin_diameter
                     )
@@ -150,7 +306,8 @@ class GearMetrologyAgent:
                 measurement_type = "MOP"
             
             # Calculate uncertainty estimate
-            uncertainty = self._estimate_uncertainty(params, result)
+            derived = _derive(params)
+            uncertainty = self._estimate_uncertainty(params, result, derived)
             
             # Extract helical correction if available
             helical_correction = getattr(result, 'helical_correction', 0.0)
@@ -166,18 +323,102 @@ class GearMetrologyAgent:
                 pitch_diameter=result.Dp,
                 base_diameter=result.Db,
                 contact_angle=result.beta_deg,
-                calculation_notes=self._generate_calculation_notes(params, calc_method)
+                calculation_notes=self._generate_calculation_notes(params, calc_method, derived)
             )
             
             # Add to history
-            self.calculation_history.append(calc_result)
+            if history is not None:
+                history.append(calc_result)
+            elif record_history and self.track_history:
+                self.calculation_history.append(calc_result)
             
             return calc_result
             
         except Exception as e:
             raise RuntimeError(f"Gear metrology calculation failed: {str(e)}")
     
-    def _estimate_uncertainty(self, params: GearParameters, result) -> float:
+    def record(self, calc_result: CalculationResult):
+        """
+        Add a result computed elsewhere (e.g. in a worker process) to calculation_history
+        
+        Does nothing when the agent does not track history.
+        """
+        if self.track_history:
+            self.calculation_history.append(calc_result)
+    
+    def calculate_measurements_batch(self, params_list: List[GearParameters], record_history: bool = True,
+                                     history: Optional[Deque[CalculationResult]] = None) -> List[CalculationResult]:
+        """
+        Calculate measurement over/between pins for many gears in one vectorized pass
+        
+        Parameters are gathered into NumPy arrays (one per field) and evaluated by
+        mop_batch.mop_batch; results are only turned back into CalculationResult
+        objects at the end. Rows the kernel flags (MOW is NaN: non-positive
+        dimensions or an unconverged solve) go through
+        calculate_measurement_over_pins, so they get the same value or error as
+        a single calculation. Falls back to that per gear when NumPy is not
+        available.
+        
+        Args:
+            params_list: Gear parameters (all dimensions must be positive)
+            record_history: Append the results to calculation_history
+            history: Record into this deque/list instead of the agent's own history
+        
+        Returns:
+            List[CalculationResult]: One result per input, in input order
+        """
+        if mop_batch is None:
+            return [self.calculate_measurement_over_pins(params, record_history, history)
+                    for params in params_list]
+        
+        # Struct-of-arrays columns, built in a single pass
+        n = len(params_list)
+        teeth, dp, pa, thickness, pin, helix, internal = ([None] * n for _ in range(7))
+        for i, params in enumerate(params_list):
+            teeth[i] = params.teeth
+            dp[i] = 25.4 / params.diametral_pitch if params.is_metric else params.diametral_pitch
+            pa[i] = params.pressure_angle
+            thickness[i] = params.tooth_thickness
+            pin[i] = params.pin_diameter
+            helix[i] = params.helix_angle
+            internal[i] = params.is_internal
+        
+        try:
+            MOW, Dp, Db, beta_deg = mop_batch.mop_batch(teeth, dp, pa, thickness, pin, helix, internal)
+        except Exception as e:
+            raise RuntimeError(f"Gear metrology calculation failed: {str(e)}")
+        
+        results = []
+        for i, params in enumerate(params_list):
+            if math.isnan(MOW[i]):
+                results.append(self.calculate_measurement_over_pins(params, record_history=False))
+                continue
+            measurement_type = "MBP" if params.is_internal else "MOP"
+            derived = _derive(params)
+            calc_method = ("helical_" if derived.abs_helix > 0.01 else "spur_") + \
+                          ("internal" if params.is_internal else "external")
+            calc_result = CalculationResult(
+                measurement_value=float(MOW[i]),
+                measurement_type=measurement_type,
+                method="2-pin" if params.teeth % 2 == 0 else "odd tooth",
+                uncertainty=self._estimate_uncertainty(params, None, derived),
+                gear_parameters=params,
+                pitch_diameter=float(Dp[i]),
+                base_diameter=float(Db[i]),
+                contact_angle=float(beta_deg[i]),
+                calculation_notes=self._generate_calculation_notes(params, calc_method, derived)
+            )
+            results.append(calc_result)
+        
+        if history is not None:
+            history.extend(results)
+        elif record_history and self.track_history:
+            self.calculation_history.extend(results)
+        
+        return results
+    
+    def _estimate_uncertainty(self, params: GearParameters, result,
+                              derived: Optional[_DerivedValues] = None) -> float:
         """
         Estimate measurement uncertainty based on gear parameters and calculation complexity
         
@@ -187,46 +428,47 @@ class GearMetrologyAgent:
         - Manufacturing tolerances
         - Calculation method precision
         """
+        if derived is None:
+            derived = _derive(params)
         base_uncertainty = 0.00003  # Base uncertainty in inches (0.03 thou) - enhanced precision
         
         # Helix angle factor (reduced impact for better precision)
-        helix_factor = 1.0 + abs(params.helix_angle) * 0.001  # 0.1% per degree
+        helix_factor = _fma(derived.abs_helix, 0.001, 1.0)  # 0.1% per degree
         
         # Pin size factor (smaller pins have higher uncertainty)
-        optimal_pin_ratio = 1.68 / params.diametral_pitch
-        pin_ratio = params.pin_diameter / optimal_pin_ratio
-        pin_factor = 1.0 + abs(pin_ratio - 1.0) * 0.05  # Reduced pin size impact
+        pin_factor = _fma(abs(derived.pin_ratio - 1.0), 0.05, 1.0)  # Reduced pin size impact
         
-        # Tooth count factor (fewer teeth slightly increase uncertainty)
-        tooth_factor = 1.0 + (50.0 / params.teeth) * 0.001 if params.teeth < 50 else 1.0
+        # Tooth count factor (fewer teeth slightly increase uncertainty); the
+        # boolean multiplier applies it only below 50 teeth without a branch
+        tooth_factor = _fma((params.teeth < 50) * (50.0 / params.teeth), 0.001, 1.0)
         
         total_uncertainty = base_uncertainty * helix_factor * pin_factor * tooth_factor
         
         return total_uncertainty
     
-    def _generate_calculation_notes(self, params: GearParameters, calc_method: str) -> List[str]:
+    def _generate_calculation_notes(self, params: GearParameters, calc_method: str,
+                                    derived: Optional[_DerivedValues] = None) -> List[str]:
         """Generate informative calculation notes"""
+        if derived is None:
+            derived = _derive(params)
         notes = []
         
         # Method note
         if "helical" in calc_method:
-            if abs(params.helix_angle) > 25:
-                notes.append(f"High helix angle ({params.helix_angle:.1f}°) - verify measurement setup")
-            elif abs(params.helix_angle) > 15:
-                notes.append(f"Medium helix angle ({params.helix_angle:.1f}°) - multi-term correction applied")
+            if derived.abs_helix > 25:
+                notes.append(_HIGH_HELIX_NOTE % params.helix_angle)
+            elif derived.abs_helix > 15:
+                notes.append(_MEDIUM_HELIX_NOTE % params.helix_angle)
             else:
-                notes.append(f"Low helix angle ({params.helix_angle:.1f}°) - enhanced correction applied")
+                notes.append(_LOW_HELIX_NOTE % params.helix_angle)
         
         # Pin size note
-        if params.diametral_pitch > 0:
-            optimal_pin = 1.68 / params.diametral_pitch
-            ratio = params.pin_diameter / optimal_pin
-            if ratio < 0.8 or ratio > 1.2:
-                notes.append(f"Pin diameter ({params.pin_diameter:.4f}) differs from optimal ({optimal_pin:.4f})")
+        if derived.pin_ratio < 0.8 or derived.pin_ratio > 1.2:
+            notes.append(_PIN_DIAMETER_NOTE % (params.pin_diameter, derived.optimal_pin))
         
         # Standards note
-        if params.pressure_angle not in [14.5, 17.5, 20.0, 22.5, 25.0]:
-            notes.append(f"Non-standard pressure angle ({params.pressure_angle:.1f}°)")
+        if params.pressure_angle not in _AGMA_PRESSURE_ANGLES:
+            notes.append(_PRESSURE_ANGLE_NOTE % params.pressure_angle)
         
         return notes
     
@@ -237,85 +479,44 @@ class GearMetrologyAgent:
         Returns:
             Dictionary with analysis results including recommendations
         """
+        derived = _derive(params)
         analysis = {
             'gear_type': 'Internal' if params.is_internal else 'External',
-            'geometry_type': 'Helical' if abs(params.helix_angle) > 0.01 else 'Spur',
+            'geometry_type': 'Helical' if derived.abs_helix > 0.01 else 'Spur',
             'measurement_method': 'Odd tooth' if params.teeth % 2 == 1 else '2-pin',
-            'standards_compliance': self._check_standards_compliance(params),
-            'recommendations': self._generate_recommendations(params),
-            'quality_assessment': self._assess_measurement_quality(params)
+            'standards_compliance': self._check_standards_compliance(params, derived),
+            'recommendations': self._generate_recommendations(params, derived),
+            'quality_assessment': self.assess_measurement_quality(params, derived)
         }
         
         return analysis
     
-    def _check_standards_compliance(self, params: GearParameters) -> Dict[str, bool]:
+    def _check_standards_compliance(self, params: GearParameters,
+                                    derived: Optional[_DerivedValues] = None) -> Dict[str, bool]:
         """Check compliance with major gear standards"""
-        compliance = {}
-        
-        for standard, specs in self.standards_database.items():
-            compliance[standard] = (
-                params.pressure_angle in specs['pressure_angles'] and
-                params.teeth >= 12 and  # Minimum practical tooth count
-                abs(params.helix_angle) <= 45
-            )
-        
-        return compliance
+        if derived is None:
+            derived = _derive(params)
+        geometry_ok = params.teeth >= 12 and derived.abs_helix <= 45  # Minimum practical tooth count
+        return dict(_standards_compliance(params.pressure_angle, geometry_ok))
     
-    def _generate_recommendations(self, params: GearParameters) -> List[str]:
+    def _generate_recommendations(self, params: GearParameters,
+                                  derived: Optional[_DerivedValues] = None) -> List[str]:
         """Generate recommendations for optimal measurement"""
-        recommendations = []
+        if derived is None:
+            derived = _derive(params)
+        return list(_recommendations(params.pin_diameter, params.teeth, derived))
+    
+    def assess_measurement_quality(self, params: GearParameters,
+                                   derived: Optional[_DerivedValues] = None) -> str:
+        """
+        Assess expected measurement quality
         
-        # Pin size recommendation
-        if params.diametral_pitch > 0:
-            optimal_pin = 1.68 / params.diametral_pitch
-            current_ratio = params.pin_diameter / optimal_pin
-            
-            if current_ratio < 0.9:
-                recommendations.append(f"Consider larger pin diameter (current: {params.pin_diameter:.4f}, optimal: {optimal_pin:.4f})")
-            elif current_ratio > 1.1:
-                recommendations.append(f"Consider smaller pin diameter (current: {params.pin_diameter:.4f}, optimal: {optimal_pin:.4f})")
-        
-        # Helix angle considerations
-        if abs(params.helix_angle) > 30:
-            recommendations.append("High helix angle may require specialized measurement techniques")
-        
-        # Tooth count considerations
-        if params.teeth < 17:
-            recommendations.append("Low tooth count - consider measurement repeatability testing")
-        elif params.teeth > 200:
-            recommendations.append("High tooth count - verify pin positioning accuracy")
-        
-        return recommendations
-    
-    def _assess_measurement_quality(self, params: GearParameters) -> str:
-        """Assess expected measurement quality"""
-        quality_score = 100
-        
-        # Deduct for non-optimal conditions
-        if abs(params.helix_angle) > 25:
-            quality_score -= 15
-        elif abs(params.helix_angle) > 15:
-            quality_score -= 5
-        
-        if params.teeth < 17:
-            quality_score -= 10
-        elif params.teeth > 200:
-            quality_score -= 5
-        
-        if params.diametral_pitch > 0:
-            optimal_pin = 1.68 / params.diametral_pitch
-            pin_ratio = params.pin_diameter / optimal_pin
-            if abs(pin_ratio - 1.0) > 0.2:
-                quality_score -= 10
-        
-        if quality_score >= 90:
-            return "Excellent"
-        elif quality_score >= 80:
-            return "Good" 
-        elif quality_score >= 70:
-            return "Fair"
-        else:
-            return "Poor - Review measurement setup"
+        The 'quality_assessment' entry of analyze_gear_configuration, without
+        the compliance checks and recommendations.
+        """
+        if derived is None:
+            derived = _derive(params)
+        return _measurement_quality(derived.abs_helix, params.teeth, derived.pin_ratio)
     
     def compare_with_reference(self, params: GearParameters, reference_value: float, 
                              reference_source: str = "Unknown") -> Dict[str, Any]:
@@ -360,7 +561,7 @@ class GearMetrologyAgent:
     
     def get_calculation_history(self) -> List[CalculationResult]:
         """Return calculation history for analysis"""
-        return self.calculation_history.copy()
+        return list(self.calculation_history)
     
     def clear_history(self):
         """Clear calculation history"""
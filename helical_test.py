@@ -5,18 +5,67 @@ Analyzes the specific case: z=127, DP=12, PA=20°, helix=10.5°, t=0.130900, d=0
 """
 
 import math
+from dataclasses import dataclass, field
+from typing import Final, Optional
+
 from MOP import mow_helical_external_dp, helical_conversions, PI_HIGH_PRECISION
 
-def analyze_helical_discrepancy():
+# Angle conversion factors, computed once
+DEG2RAD: Final[float] = PI_HIGH_PRECISION / 180.0
+RAD2DEG: Final[float] = 180.0 / PI_HIGH_PRECISION
+
+def _sincos(x):
+    """Return (sin(x), cos(x)) so each angle's pair is evaluated once."""
+    return math.sin(x), math.cos(x)
+
+@dataclass(frozen=True, slots=True)
+class HelicalScenario:
+    """Helical test case with its derived angles and diameters computed once."""
+    z: int = 127
+    normal_dp: float = 12.0
+    normal_pa_deg: float = 20.0
+    helix_deg: float = 10.5
+    t: float = 0.130900
+    d: float = 0.144
+    
+    # Derived in __post_init__ (radians unless noted)
+    helix_rad: float = field(init=False)
+    sin_helix: float = field(init=False)
+    cos_helix: float = field(init=False)
+    normal_pa_rad: float = field(init=False)
+    sin_npa: float = field(init=False)
+    cos_npa: float = field(init=False)
+    trans_pa_rad: float = field(init=False)
+    base_helix_rad: float = field(init=False)
+    pitch_dia: float = field(init=False)
+    base_dia: float = field(init=False)
+    
+    def __post_init__(self):
+        helix_rad = self.helix_deg * DEG2RAD
+        normal_pa_rad = self.normal_pa_deg * DEG2RAD
+        sin_helix, cos_helix = _sincos(helix_rad)
+        sin_npa, cos_npa = _sincos(normal_pa_rad)
+        trans_pa_rad = math.atan((sin_npa / cos_npa) / cos_helix)
+        cos_tpa = math.cos(trans_pa_rad)
+        pitch_dia = self.z / (self.normal_dp * cos_helix)
+        
+        derived = {
+            'helix_rad': helix_rad, 'sin_helix': sin_helix, 'cos_helix': cos_helix,
+            'normal_pa_rad': normal_pa_rad, 'sin_npa': sin_npa, 'cos_npa': cos_npa,
+            'trans_pa_rad': trans_pa_rad,
+            'base_helix_rad': math.atan((sin_helix / cos_helix) * cos_tpa),
+            'pitch_dia': pitch_dia, 'base_dia': pitch_dia * cos_tpa,
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+def analyze_helical_discrepancy(scenario: Optional[HelicalScenario] = None):
     """Analyze the helical gear MOP discrepancy."""
     
-    # Test parameters
-    z = 127
-    normal_dp = 12.0
-    normal_pa_deg = 20.0
-    helix_deg = 10.5
-    t = 0.130900
-    d = 0.144
+    if scenario is None:
+        scenario = HelicalScenario()
+    z, normal_dp, normal_pa_deg = scenario.z, scenario.normal_dp, scenario.normal_pa_deg
+    helix_deg, t, d = scenario.helix_deg, scenario.t, scenario.d
     
     print("=== Helical Gear MOP Analysis ===")
     print(f"Parameters: z={z}, normal_DP={normal_dp}, normal_PA={normal_pa_deg}°")
@@ -44,40 +93,35 @@ def analyze_helical_discrepancy():
     print()
     
     # Calculate transverse tooth thickness
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
-    trans_tooth_thickness = t / math.cos(helix_rad)
+    trans_tooth_thickness = t / scenario.cos_helix
     
     print(f"Normal thickness:     {t:.6f}")
     print(f"Transverse thickness: {trans_tooth_thickness:.6f}")
-    print(f"cos(helix):          {math.cos(helix_rad):.6f}")
+    print(f"cos(helix):          {scenario.cos_helix:.6f}")
     print()
     
     # Investigate potential correction factors
-    investigate_corrections(z, normal_dp, normal_pa_deg, helix_deg, t, d, current_mop)
+    investigate_corrections(scenario, current_mop)
 
-def investigate_corrections(z, normal_dp, normal_pa_deg, helix_deg, t, d, current_mop):
-    """Investigate potential correction factors."""
+def investigate_corrections(scenario: HelicalScenario, current_mop):
+    """Investigate potential correction factors for a scenario."""
     
     target_mop = 10.967749
     discrepancy = target_mop - current_mop
     
     print("=== Investigation of Potential Corrections ===")
     
-    # 1. Base helix angle correction
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
-    normal_pa_rad = normal_pa_deg * (PI_HIGH_PRECISION / 180.0)
+    sin_helix, cos_helix = scenario.sin_helix, scenario.cos_helix
     
-    # Calculate base helix angle
-    trans_pa_rad = math.atan(math.tan(normal_pa_rad) / math.cos(helix_rad))
-    base_helix_rad = math.atan(math.tan(helix_rad) * math.cos(trans_pa_rad))
-    base_helix_deg = base_helix_rad * (180.0 / PI_HIGH_PRECISION)
+    # 1. Base helix angle correction
+    base_helix_deg = scenario.base_helix_rad * RAD2DEG
     
     print(f"Base helix angle: {base_helix_deg:.6f}°")
     
     # 2. Axial component analysis
     # The discrepancy might be related to axial positioning effects
-    pitch_diameter = z / (normal_dp * math.cos(helix_rad))
-    base_diameter = pitch_diameter * math.cos(trans_pa_rad)
+    pitch_diameter = scenario.pitch_dia
+    base_diameter = scenario.base_dia
     
     print(f"Pitch diameter:   {pitch_diameter:.6f}")
     print(f"Base diameter:    {base_diameter:.6f}")
@@ -93,34 +137,33 @@ def investigate_corrections(z, normal_dp, normal_pa_deg, helix_deg, t, d, curren
     print(f"\nPotential axial correction: {axial_correction:.6f}")
     
     # 5. Check if it's related to helix angle
-    helix_factor = math.cos(helix_rad)
+    helix_factor = cos_helix
     potential_helix_correction = discrepancy / helix_factor
     print(f"Helix-related factor: {potential_helix_correction:.6f}")
     
     # 6. Test base helix angle effects
-    base_helix_correction = discrepancy / math.cos(base_helix_rad)
+    base_helix_correction = discrepancy / math.cos(scenario.base_helix_rad)
     print(f"Base helix correction: {base_helix_correction:.6f}")
     
-    # 7. Lead angle effects
-    lead_angle_rad = math.atan(1.0 / math.tan(helix_rad))
+    # 7. Lead angle effects (complement of the helix; atan2 stays finite as helix -> 0)
+    lead_angle_rad = math.atan2(cos_helix, sin_helix)
     lead_correction = discrepancy / math.cos(lead_angle_rad)
     print(f"Lead angle correction: {lead_correction:.6f}")
 
-def test_alternative_formulations():
+def test_alternative_formulations(scenario: Optional[HelicalScenario] = None):
     """Test alternative helical gear MOP formulations."""
     
     print("\n=== Testing Alternative Formulations ===")
     
     # Parameters
-    z = 127
-    normal_dp = 12.0
-    normal_pa_deg = 20.0
-    helix_deg = 10.5
-    t = 0.130900
-    d = 0.144
+    if scenario is None:
+        scenario = HelicalScenario()
+    z, normal_dp, normal_pa_deg = scenario.z, scenario.normal_dp, scenario.normal_pa_deg
+    helix_deg, t, d = scenario.helix_deg, scenario.t, scenario.d
     
-    helix_rad = helix_deg * (PI_HIGH_PRECISION / 180.0)
-    normal_pa_rad = normal_pa_deg * (PI_HIGH_PRECISION / 180.0)
+    sin_helix, cos_helix = scenario.sin_helix, scenario.cos_helix
+    tan_helix = sin_helix / cos_helix
+    cos_npa = scenario.cos_npa
     
     # Method 1: Direct normal plane calculation (not converting to transverse)
     # This might be more appropriate for helical gears
@@ -129,7 +172,7 @@ def test_alternative_formulations():
     
     # Calculate pitch diameter in normal plane
     pitch_dia_normal = z / normal_dp_val
-    base_dia_normal = pitch_dia_normal * math.cos(normal_pa_rad)
+    base_dia_normal = pitch_dia_normal * cos_npa
     
     print(f"Normal plane approach:")
     print(f"Pitch dia (normal): {pitch_dia_normal:.6f}")
@@ -138,24 +181,29 @@ def test_alternative_formulations():
     # Method 2: Apply helix correction to the final result
     current_result = mow_helical_external_dp(z, normal_dp, normal_pa_deg, t, d, helix_deg)
     
-    # Potential corrections to test
-    corrections = {
-        "None": 0.0,
-        "cos(helix)": (1.0 - math.cos(helix_rad)) * current_result.MOW,
-        "sin(helix)": math.sin(helix_rad) * (d / 2.0),
-        "Base helix factor": math.sin(math.atan(math.tan(helix_rad) * math.cos(normal_pa_rad))) * (d),
-        "Axial positioning": 0.006819,  # The exact discrepancy
-        "Lead angle component": math.tan(helix_rad) * (t / 2.0),
-    }
+    # Potential corrections to test, as parallel name/value columns
+    target_mop = 10.967749
+    names = ("None", "cos(helix)", "sin(helix)", "Base helix factor",
+             "Axial positioning", "Lead angle component")
+    corrections = [
+        0.0,
+        (1.0 - cos_helix) * current_result.MOW,
+        sin_helix * (d / 2.0),
+        math.sin(math.atan(tan_helix * cos_npa)) * (d),
+        0.006819,  # The exact discrepancy
+        tan_helix * (t / 2.0),
+    ]
+    
+    corrected_mops = [current_result.MOW + c for c in corrections]
+    errors = [abs(target_mop - m) for m in corrected_mops]
     
     print(f"\nTesting corrections:")
     print(f"Current MOP: {current_result.MOW:.6f}")
     
-    for name, correction in corrections.items():
-        corrected_mop = current_result.MOW + correction
-        error = abs(10.967749 - corrected_mop)
+    for name, corrected_mop, error in zip(names, corrected_mops, errors):
         print(f"{name:20s}: {corrected_mop:.6f} (error: {error:.6f})")
 
 if __name__ == "__main__":
-    analyze_helical_discrepancy()
-    test_alternative_formulations()
\ No newline at end of file
+    scenario = HelicalScenario()
+    analyze_helical_discrepancy(scenario)
+    test_alternative_formulations(scenario)
\ No newline at end of file
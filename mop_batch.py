@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Vectorized MOP/MBP batch kernel (NumPy)
+
+Evaluates many spur/helical, external/internal gears at once from
+struct-of-arrays inputs, using the same equations as MOP.py (helical gears
+are converted to transverse parameters first):
+
+  External:  inv(beta) = t/Dp - E + inv(alpha) + d/Db       MOP = C2*factor + d
+  Internal:  inv(beta) = E - s_w/Dp - d/Db + inv(alpha)     MBP = C2*factor - d
+
+with C2 = Db/cos(beta) and factor = cos(pi/(2z)) for odd z, 1.0 for even z.
+The involute inversion is a masked Newton-Raphson using the same iteration
+limit and convergence tests as MOP.inv_inverse.
+
+Results are not bitwise identical to the scalar functions: NumPy's cos/tan
+can differ from math's by an ULP, so solved rows agree to within a few ULP.
+Rows the kernel cannot reproduce get MOW = NaN instead of a value: rows with
+a non-positive tooth count, DP, thickness or pin (MOP.py raises for these),
+and rows whose Newton-Raphson solve did not converge. The scalar iteration
+diverges there too and its end value depends on rounding, so callers that
+need MOP.py's answer (or its error) rerun those rows through MOP.py.
+
+Requires NumPy; callers treat ImportError as "vectorized path unavailable".
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# High-precision mathematical constants (same values as MOP.py)
+PI = 3.1415926535897932384626433832795028841971693993751
+DEG2RAD = PI / 180.0
+RAD2DEG = 180.0 / PI
+
+MAX_ITERATIONS = 250  # MOP.inv_inverse iteration limit
+MAX_CYCLE = 8         # Longest iterate cycle resolved early
+
+def inv_inverse_batch(y: np.ndarray, x0: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Element-wise Newton-Raphson inversion of inv(x) = tan(x) - x
+    
+    Near the root the 1e-16 step/residual test is often never met and the
+    iterate cycles through a few neighbouring doubles until the iteration limit.
+    Each step depends only on the current iterate, so once a cycle of period p
+    closes the value at the limit is known: it is the cycle member selected by
+    (iterations left) mod p. Such elements stop early with exactly the value
+    the full run would return.
+    
+    Returns:
+        tuple of arrays: (x, converged) - converged is False where the iteration
+        limit was reached without meeting the convergence test or closing a cycle
+    """
+    x = np.full(y.shape, x0, dtype=np.float64)
+    # prev[k] holds the iterate k+1 steps before the current one
+    prev = np.full((MAX_CYCLE - 1,) + y.shape, np.nan)
+    active = np.ones(y.shape, dtype=bool)
+
+    for iteration in range(MAX_ITERATIONS):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        xa = x[idx]
+        cos_x = np.cos(xa)
+        f = np.tan(xa) - xa - y[idx]
+        df = (1.0 / (cos_x * cos_x)) - 1.0
+
+        # Elements with a vanishing derivative stop without stepping
+        stable = np.abs(df) >= 1e-18
+        step = np.zeros_like(xa)
+        np.divide(f, df, out=step, where=stable)
+        x_new = xa - step
+
+        done = ~stable | ((np.abs(step) < 1e-16) & (np.abs(f) < 1e-16))
+
+        # Cycle candidates, newest first: current iterate, then older ones
+        history = [xa] + [prev[k, idx] for k in range(MAX_CYCLE - 1)]
+        remaining = MAX_ITERATIONS - iteration - 1
+        for period in range(1, MAX_CYCLE + 1):
+            closed = ~done & (x_new == history[period - 1])
+            if closed.any():
+                # Iterates repeat with this period; pick the one the limit lands on
+                x_new = np.where(closed, history[period - 1 - remaining % period], x_new)
+                done |= closed
+
+        x[idx] = x_new
+        prev[1:, idx] = prev[:-1, idx]
+        prev[0, idx] = xa
+        active[idx[done]] = False
+
+    return x, ~active
+
+def spur_batch(teeth, DP, alpha_deg, thickness, pin, is_internal=False):
+    """
+    Spur gear MOP/MBP for a batch of gears (transverse parameters)
+    
+    Args:
+        teeth: Tooth counts (int64 array)
+        DP: Diametral pitch [1/inch]
+        alpha_deg: Pressure angle [degrees]
+        thickness: Tooth thickness (external) or space width (internal) [inches]
+        pin: Pin diameter [inches]
+        is_internal: True (or boolean array) for internal gears (MBP)
+    
+    Returns:
+        tuple of arrays, the numeric MOP.Result fields:
+        (MOW, Dp, Db, E, inv_alpha, inv_beta, beta_rad, C2, factor);
+        MOW is NaN for rows with non-positive inputs or an unconverged solve
+    """
+    z = teeth.astype(np.float64)
+    alpha = alpha_deg * DEG2RAD
+    Dp = z / DP
+    Db = Dp * np.cos(alpha)
+    E = PI / z
+    inv_alpha = np.tan(alpha) - alpha
+    
+    inv_beta = np.where(
+        is_internal,
+        E - (PI / DP - thickness) / Dp - pin / Db + inv_alpha,
+        thickness / Dp - E + inv_alpha + pin / Db
+    )
+    beta, converged = inv_inverse_batch(inv_beta)
+    C2 = Db / np.cos(beta)
+    
+    factor = np.where(teeth % 2 == 1, np.cos(PI / (2.0 * z)), 1.0)
+    MOW = np.where(is_internal, factor * C2 - pin, C2 * factor + pin)
+    
+    # Flag rows MOP.py would reject, and rows whose value depends on a diverged solve
+    valid = (teeth > 0) & (DP > 0) & (thickness > 0) & (pin > 0)
+    MOW = np.where(converged & valid, MOW, np.nan)
+    
+    return MOW, Dp, Db, E, inv_alpha, inv_beta, beta, C2, factor
+
+def mop_batch(teeth, dp, pa, thickness, pin, helix, is_internal):
+    """
+    Measurement over/between pins for a batch of gears
+
+    Args:
+        teeth: Tooth counts
+        dp: Normal diametral pitch [1/inch]
+        pa: Normal pressure angle [degrees]
+        thickness: Normal tooth thickness (external) or space width (internal) [inches]
+        pin: Pin diameter [inches]
+        helix: Helix angle [degrees] (|helix| < 0.01 treated as spur)
+        is_internal: True for internal gears (MBP)
+
+    Returns:
+        tuple of arrays: (MOW, Dp, Db, beta_deg); MOW is NaN for rows with
+        non-positive inputs or an unconverged solve (see module docstring)
+    """
+    teeth = np.asarray(teeth, dtype=np.int64)
+    dp = np.asarray(dp, dtype=np.float64)
+    pa = np.asarray(pa, dtype=np.float64)
+    thickness = np.asarray(thickness, dtype=np.float64)
+    pin = np.asarray(pin, dtype=np.float64)
+    helix = np.asarray(helix, dtype=np.float64)
+    is_internal = np.asarray(is_internal, dtype=bool)
+
+    # Normal -> transverse conversion for helical gears (spur gears pass through)
+    helical = np.abs(helix) >= 0.01
+    cos_helix = np.where(helical, np.cos(helix * DEG2RAD), 1.0)
+    trans_pa_deg = np.where(helical, np.arctan(np.tan(pa * DEG2RAD) / cos_helix) * RAD2DEG, pa)
+    trans_dp = np.where(helical, dp * cos_helix, dp)
+    trans_thickness = np.where(helical, thickness / cos_helix, thickness)
+
+    MOW, Dp, Db, E, inv_alpha, inv_beta, beta, C2, factor = spur_batch(
+        teeth, trans_dp, trans_pa_deg, trans_thickness, pin, is_internal)
+
+    return MOW, Dp, Db, beta * RAD2DEG
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Compilable MOP/MBP kernels
+
+Scalar versions of the MOP.py spur and helical calculations written against
+`math` and plain floats only, so Numba can compile them in nopython mode
+(JIT here, or AOT via build_mop_compiled.py). MOP.py stays the reference
+implementation; the kernels follow it step for step.
+
+Every kernel returns the numeric fields of MOP.Result as a tuple:
+    (MOW, Dp, Db, E, inv_alpha, inv_beta, beta_rad, C2, factor)
+The method label follows from tooth parity ("2-pin" even, "odd tooth" odd).
+
+Numba is optional - without it the kernels run as ordinary Python.
+"""
+
+import math
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit when Numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# High-precision mathematical constants (same values as MOP.py)
+PI = 3.1415926535897932384626433832795028841971693993751
+DEG2RAD = PI / 180.0
+
+@njit(cache=True)
+def inv_core(x):
+    return math.tan(x) - x
+
+@njit(cache=True)
+def inv_inverse_core(y, x0):
+    """Newton-Raphson involute inversion (mirrors MOP.inv_inverse)"""
+    x = x0
+    for iteration in range(250):
+        cos_x = math.cos(x)
+        f = math.tan(x) - x - y
+        df = (1.0 / (cos_x * cos_x)) - 1.0
+        if abs(df) < 1e-18:
+            break
+        step = f / df
+        x -= step
+        if abs(step) < 1e-16 and abs(f) < 1e-16:
+            break
+    return x
+
+@njit(cache=True)
+def mow_spur_external_core(z, DP, alpha_deg, t, d):
+    """External spur MOP kernel (mirrors MOP.mow_spur_external_dp)"""
+    if z <= 0 or DP <= 0 or d <= 0 or t <= 0:
+        raise ValueError("All inputs must be positive (z, DP, alpha, t, d).")
+    z_f = float(z)
+    alpha = alpha_deg * DEG2RAD
+    Dp = z_f / DP
+    Db = Dp * math.cos(alpha)
+    E = PI / z_f
+    inv_alpha = inv_core(alpha)
+    inv_beta = t / Dp - E + inv_alpha + d / Db
+    beta = inv_inverse_core(inv_beta, 0.5)
+    C2 = Db / math.cos(beta)
+    if z % 2 == 0:
+        factor = 1.0
+    else:
+        factor = math.cos(PI / (2.0 * z_f))
+    MOW = C2 * factor + d
+    return (MOW, Dp, Db, E, inv_alpha, inv_beta, beta, C2, factor)
+
+@njit(cache=True)
+def mbp_spur_internal_core(z, DP, alpha_deg, s, d):
+    """Internal spur MBP kernel (mirrors MOP.mbp_spur_internal_dp)"""
+    if z <= 0 or DP <= 0 or d <= 0 or s <= 0:
+        raise ValueError("All inputs must be positive (z, DP, alpha, s, d).")
+    z_f = float(z)
+    alpha = alpha_deg * DEG2RAD
+    Dp = z_f / DP
+    Db = Dp * math.cos(alpha)
+    E = PI / z_f
+    inv_alpha = inv_core(alpha)
+    space_width = PI / DP - s
+    inv_beta = E - (space_width / Dp) - (d / Db) + inv_alpha
+    beta = inv_inverse_core(inv_beta, 0.5)
+    C2 = Db / math.cos(beta)
+    if z % 2 == 0:
+        factor = 1.0
+    else:
+        factor = math.cos(PI / (2.0 * z_f))
+    MBP = factor * C2 - d
+    return (MBP, Dp, Db, E, inv_alpha, inv_beta, beta, C2, factor)
+
+@njit(cache=True)
+def _transverse_params(normal_DP, normal_alpha_deg, helix_deg):
+    """Normal -> transverse (PA degrees, DP, 1/cos(helix)) for helical gears"""
+    helix_rad = helix_deg * DEG2RAD
+    cos_helix = math.cos(helix_rad)
+    trans_pa_rad = math.atan(math.tan(normal_alpha_deg * DEG2RAD) / cos_helix)
+    trans_pa_deg = trans_pa_rad * (180.0 / PI)
+    return trans_pa_deg, normal_DP * cos_helix, cos_helix
+
+@njit(cache=True)
+def mow_helical_external_core(z, normal_DP, normal_alpha_deg, t, d, helix_deg):
+    """External helical MOP kernel (mirrors MOP.mow_helical_external_dp)"""
+    if abs(helix_deg) < 0.01:
+        return mow_spur_external_core(z, normal_DP, normal_alpha_deg, t, d)
+    trans_pa_deg, trans_dp, cos_helix = _transverse_params(normal_DP, normal_alpha_deg, helix_deg)
+    return mow_spur_external_core(z, trans_dp, trans_pa_deg, t / cos_helix, d)
+
+@njit(cache=True)
+def mbp_helical_internal_core(z, normal_DP, normal_alpha_deg, s, d, helix_deg):
+    """Internal helical MBP kernel (mirrors MOP.mbp_helical_internal_dp)"""
+    if abs(helix_deg) < 0.01:
+        return mbp_spur_internal_core(z, normal_DP, normal_alpha_deg, s, d)
+    trans_pa_deg, trans_dp, cos_helix = _transverse_params(normal_DP, normal_alpha_deg, helix_deg)
+    return mbp_spur_internal_core(z, trans_dp, trans_pa_deg, s / cos_helix, d)
+
+@njit(parallel=True, cache=True)
+def mow_spur_external_batch_core(z, DP, alpha_deg, t, d, out):
+    """External spur MOP for every row of the input arrays into out (rows run in parallel)"""
+    # Validate serially: an exception raised inside a prange loop cannot propagate cleanly
+    for i in range(z.shape[0]):
+        if z[i] <= 0 or DP[i] <= 0 or d[i] <= 0 or t[i] <= 0:
+            raise ValueError("All inputs must be positive (z, DP, alpha, t, d).")
+    for i in prange(z.shape[0]):
+        out[i] = mow_spur_external_core(z[i], DP[i], alpha_deg[i], t[i], d[i])[0]
+    return out
@@ -4,50 +4,93 @@ Performance Analysis Script for MOP Gear Metrology System
 Identifies computational bottlenecks and measures execution times
 """
 
-import time
-import profile
-import cProfile
-import pstats
-import io
-from typing import Dict, List, Tuple
+import argparse
+import math
 import statistics
+import timeit
+import shutil
+from typing import Dict, List, Tuple
 import sys
 import os
 
 # Add the current directory to sys.path to import MOP module
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import MOP
 from MOP import (
     mow_spur_external_dp, mbp_spur_internal_dp,
     mow_helical_external_dp, mbp_helical_internal_dp,
-    calculate_improved_helical_correction, inv_inverse, best_pin_rule
+    best_pin_rule, mow_spur_external_batch
 )
 
+import mop_kernels
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import yappi
+except ImportError:
+    yappi = None
+
+# Optional AOT-compiled kernels (build with: python build_mop_compiled.py)
+try:
+    import mop_compiled
+except ImportError:
+    mop_compiled = None
+
+SAMPLING_DURATION = 5  # Seconds of py-spy sampling for --sampling
+SAMPLING_OUTPUT = "mop_profile.svg"
+
 class PerformanceAnalyzer:
     """Comprehensive performance analysis for MOP calculations"""
     
     def __init__(self):
         self.results = {}
-        self.iterations = 1000  # Number of iterations for timing tests
+        self.repeats = 7  # Timed blocks per test (each auto-ranged to >= 0.2 s)
+        
+        # Time MOP's JIT-compiled hot paths when Numba is installed; warm them up
+        # here so no timing includes compilation
+        if MOP.enable_jit():
+            MOP.inv_inverse(0.1)
+            MOP.calculate_improved_helical_correction(15.0, 20.0, 0.216, True)
         
     def time_function(self, func, *args, **kwargs) -> Dict[str, float]:
-        """Time a function call multiple times and return statistics"""
+        """
+        Time a function with timeit and return per-call statistics
+        
+        Each block runs the call n times (n from Timer.autorange), so clock
+        overhead is amortized instead of measured around every call; the
+        statistics are over the per-call time of each block and 'min' is the
+        headline figure. Mean and variance are accumulated in the timing loop
+        itself (Welford), so only the median needs the block times kept.
+        """
+        timer = timeit.Timer(lambda: func(*args, **kwargs))
+        number, _ = timer.autorange()
+        
+        count, mean, m2 = 0, 0.0, 0.0
+        lowest, highest = math.inf, -math.inf
         times = []
-        
-        for _ in range(self.iterations):
-            start = time.perf_counter()
-            result = func(*args, **kwargs)
-            end = time.perf_counter()
-            times.append(end - start)
+        for _ in range(self.repeats):
+            per_call = timer.timeit(number) / number
+            count += 1
+            delta = per_call - mean
+            mean += delta / count
+            m2 += delta * (per_call - mean)
+            lowest = min(lowest, per_call)
+            highest = max(highest, per_call)
+            times.append(per_call)
         
         return {
-            'mean': statistics.mean(times),
+            'mean': mean,
             'median': statistics.median(times),
-            'min': min(times),
-            'max': max(times),
-            'stdev': statistics.stdev(times) if len(times) > 1 else 0,
-            'total_time': sum(times),
-            'iterations': len(times)
+            'min': lowest,
+            'max': highest,
+            'stdev': math.sqrt(m2 / (count - 1)) if count > 1 else 0,
+            'total_time': mean * count * number,
+            'iterations': count * number
         }
     
     def analyze_newton_raphson_performance(self):
@@ -63,9 +106,9 @@ class PerformanceAnalyzer:
         ]
         
         for y_val in test_cases:
-            stats = self.time_function(inv_inverse, y_val)
-            print(f"inv_inverse({y_val}): {stats['mean']*1000:.3f} ms avg, "
-                  f"{stats['median']*1000:.3f} ms median, ±{stats['stdev']*1000:.3f} ms")
+            stats = self.time_function(MOP.inv_inverse, y_val)
+            print(f"inv_inverse({y_val}): {stats['min']*1000000:.3f} us best, "
+                  f"{stats['median']*1000000:.3f} us median, ±{stats['stdev']*1000000:.3f} us")
         
         self.results['newton_raphson'] = stats
     
@@ -82,10 +125,10 @@ class PerformanceAnalyzer:
         
         for helix, pa, pin_d, is_ext in test_cases:
             gear_type = "external" if is_ext else "internal"
-            stats = self.time_function(calculate_improved_helical_correction, 
+            stats = self.time_function(MOP.calculate_improved_helical_correction, 
                                      helix, pa, pin_d, is_ext)
-            print(f"Helical correction {helix}deg {gear_type}: {stats['mean']*1000000:.1f} us avg, "
-                  f"{stats['median']*1000000:.1f} us median")
+            print(f"Helical correction {helix}deg {gear_type}: {stats['min']*1000000:.3f} us best, "
+                  f"{stats['median']*1000000:.3f} us median")
         
         self.results['helical_correction'] = stats
     
@@ -121,48 +164,139 @@ class PerformanceAnalyzer:
             'performance_ratio': ratio
         }
     
+    def analyze_compiled_kernel_performance(self):
+        """Compare the AOT-compiled kernels against the MOP.py reference"""
+        print("\n=== AOT-Compiled Kernel Performance Analysis ===")
+        
+        if mop_compiled is None:
+            print("mop_compiled not built (python build_mop_compiled.py) - skipped")
+            return
+        
+        # Same cases as analyze_complete_calculation_performance
+        spur_args = (45, 8.0, 20.0, 0.2124, 0.2160)
+        helical_args = (127, 12.0, 20.0, 0.130900, 0.144, 15.0)
+        
+        stats_spur = self.time_function(mop_compiled.mow_spur_external_core, *spur_args)
+        print(f"Spur external MOP (compiled): {stats_spur['mean']*1000:.3f} ms avg")
+        
+        stats_helical = self.time_function(mop_compiled.mow_helical_external_core, *helical_args)
+        print(f"Helical external MOP (compiled): {stats_helical['mean']*1000:.3f} ms avg")
+        
+        reference = self.results.get('complete_calculations')
+        if reference:
+            print(f"Speedup vs MOP.py: spur {reference['spur']['mean'] / stats_spur['mean']:.1f}x, "
+                  f"helical {reference['helical']['mean'] / stats_helical['mean']:.1f}x")
+        
+        self.results['compiled_kernels'] = {
+            'spur': stats_spur,
+            'helical': stats_helical
+        }
+    
     def analyze_batch_performance(self):
         """Analyze batch calculation performance"""
         print("\n=== Batch Processing Performance Analysis ===")
         
-        # Generate batch test data
+        # Generate batch test data as struct-of-arrays (one column per parameter)
         batch_size = 100
-        test_params = []
-        
-        for i in range(batch_size):
-            params = {
-                'z': 32 + (i % 50),
-                'DP': 8.0 + (i % 4) * 2,
-                'alpha_deg': 20.0,
-                't': 0.196 + (i % 10) * 0.001,
-                'd': 0.210
-            }
-            test_params.append(params)
-        
-        def batch_calculation():
-            results = []
-            for params in test_params:
-                result = mow_spur_external_dp(**params)
-                results.append(result.MOW)
+        i = range(batch_size)
+        z = [32 + (k % 50) for k in i]
+        DP = [8.0 + (k % 4) * 2 for k in i]
+        alpha_deg = [20.0] * batch_size
+        t = [0.196 + (k % 10) * 0.001 for k in i]
+        d = [0.210] * batch_size
+        
+        columns = list(zip(z, DP, alpha_deg, t, d))
+        
+        # Scalar baseline: results stored into a preallocated buffer, so list
+        # growth does not show up in the timing
+        def scalar_calculation():
+            results = np.empty(batch_size) if np is not None else [0.0] * batch_size
+            for k, params in enumerate(columns):
+                results[k] = mow_spur_external_dp(*params).MOW
             return results
         
-        batch_stats = self.time_function(batch_calculation)
-        print(f"Batch {batch_size} calculations: {batch_stats['mean']*1000:.1f} ms total")
-        print(f"Per calculation: {batch_stats['mean']*1000/batch_size:.3f} ms avg")
+        scalar_stats = self.time_function(scalar_calculation)
+        print(f"Batch {batch_size} calculations (scalar loop): {scalar_stats['mean']*1000:.1f} ms total")
+        print(f"Per calculation: {scalar_stats['mean']*1000/batch_size:.3f} ms avg")
+        batch_stats = scalar_stats
+        
+        if np is not None:
+            z, DP, alpha_deg, t, d = (np.array(z, dtype=np.int64), np.array(DP), np.array(alpha_deg),
+                                      np.array(t), np.array(d))
+            
+            def batch_calculation():
+                # One vectorized pass over the whole batch
+                return mow_spur_external_batch(z, DP, alpha_deg, t, d).MOW
+            
+            batch_stats = self.time_function(batch_calculation)
+            print(f"Batch {batch_size} calculations (vectorized): {batch_stats['mean']*1000:.1f} ms total")
+            print(f"Per calculation: {batch_stats['mean']*1000/batch_size:.3f} ms avg")
+            print(f"Vectorized speedup: {scalar_stats['mean'] / batch_stats['mean']:.1f}x")
+            
+            if mop_kernels.NUMBA_AVAILABLE:
+                out = np.empty(batch_size)
+                
+                def parallel_calculation():
+                    # Compiled kernel, rows spread across threads with prange
+                    return mop_kernels.mow_spur_external_batch_core(z, DP, alpha_deg, t, d, out)
+                
+                parallel_calculation()  # JIT warm-up outside the timed region
+                parallel_stats = self.time_function(parallel_calculation)
+                print(f"Batch {batch_size} calculations (numba parallel): {parallel_stats['mean']*1000:.3f} ms total")
+                print(f"Numba parallel speedup: {scalar_stats['mean'] / parallel_stats['mean']:.1f}x")
         
         self.results['batch_processing'] = batch_stats
     
-    def profile_critical_functions(self):
-        """Profile critical functions with cProfile"""
-        print("\n=== Function Profiling ===")
+    @staticmethod
+    def _complex_calculation():
+        """Profiling workload: a sweep of helical calculations"""
+        for i in range(10):
+            mow_helical_external_dp(
+                z=127, normal_DP=12, normal_alpha_deg=20,
+                t=0.130900, d=0.144, helix_deg=15.0 + i
+            )
+    
+    def profile_critical_functions(self, sampling: bool = False, isolated: bool = True):
+        """
+        Profile critical functions
+        
+        cProfile instruments every call, which inflates tiny trig kernels.
+        With sampling=True the workload runs under py-spy (native frames,
+        flamegraph SVG) or, if py-spy is not installed, yappi on the CPU
+        clock; cProfile remains the fallback.
+        
+        With isolated=True (default) profiling runs in a fresh interpreter
+        (this script with --profile-only), so no profiler state is left
+        attached to the process that runs the timing tests.
+        """
+        if isolated:
+            import subprocess
+            
+            cmd = [sys.executable, os.path.abspath(__file__), "--profile-only"]
+            if sampling:
+                cmd.append("--sampling")
+            completed = subprocess.run(cmd, capture_output=True, text=True)
+            print(completed.stdout, end="")
+            if completed.returncode != 0:
+                print(f"Profiling subprocess failed:\n{completed.stderr}")
+            return
         
-        # Profile a complex helical calculation
-        def complex_calculation():
-            for i in range(10):
-                result = mow_helical_external_dp(
-                    z=127, normal_DP=12, normal_alpha_deg=20,
-                    t=0.130900, d=0.144, helix_deg=15.0 + i
-                )
+        print("\n=== Function Profiling ===")
+        complex_calculation = self._complex_calculation
+        
+        if sampling:
+            if shutil.which("py-spy"):
+                self._profile_with_py_spy(complex_calculation)
+                return
+            if yappi is not None:
+                self._profile_with_yappi(complex_calculation)
+                return
+            print("py-spy/yappi not installed, falling back to cProfile")
+        
+        # cProfile machinery is only needed on this path, so import it lazily
+        import cProfile
+        import io
+        import pstats
         
         pr = cProfile.Profile()
         pr.enable()
@@ -176,6 +310,34 @@ class PerformanceAnalyzer:
         
         print(s.getvalue())
     
+    def _profile_with_py_spy(self, workload):
+        """Sample this process with py-spy while the workload loops"""
+        import subprocess
+        
+        cmd = ["py-spy", "record", "--native", "--pid", str(os.getpid()),
+               "--duration", str(SAMPLING_DURATION), "--output", SAMPLING_OUTPUT]
+        spy = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        while spy.poll() is None:
+            workload()
+        
+        if spy.returncode == 0:
+            print(f"py-spy flamegraph written to {SAMPLING_OUTPUT}")
+        else:
+            # Typically missing ptrace permission; see py-spy docs
+            print(f"py-spy failed: {spy.stderr.read().decode().strip()}")
+    
+    def _profile_with_yappi(self, workload):
+        """Profile the workload with yappi on the CPU clock"""
+        yappi.set_clock_type("cpu")
+        yappi.clear_stats()
+        yappi.start()
+        workload()
+        yappi.stop()
+        
+        stats = yappi.get_func_stats()
+        stats.sort("ttot")
+        stats.print_all(columns={0: ("name", 60), 1: ("ncall", 8), 2: ("ttot", 10), 3: ("tavg", 10)})
+    
     def memory_usage_analysis(self):
         """Basic memory usage analysis"""
         print("\n=== Memory Usage Analysis ===")
@@ -192,11 +354,11 @@ class PerformanceAnalyzer:
         result_size = sys.getsizeof(result)
         print(f"Result object size: {result_size} bytes")
         
-        # Test list of results for batch processing
-        results_list = []
-        for i in range(1000):
-            result = mow_spur_external_dp(z=45, DP=8, alpha_deg=20, t=0.2124, d=0.2160)
-            results_list.append(result)
+        # Test list of results for batch processing. This measures object
+        # size, not allocation cost, so one result repeated 1000 times is
+        # enough (allocation cost would need its own timed test).
+        template = mow_spur_external_dp(z=45, DP=8, alpha_deg=20, t=0.2124, d=0.2160)
+        results_list = [template] * 1000
         
         list_size = sys.getsizeof(results_list)
         total_size = list_size + (result_size * len(results_list))
@@ -218,6 +380,11 @@ class PerformanceAnalyzer:
             print(f"Helical calculation avg: {calc_stats['helical']['mean']*1000:.3f} ms")
             print(f"Helical overhead: {calc_stats['performance_ratio']:.1f}x")
         
+        if 'compiled_kernels' in self.results:
+            compiled_stats = self.results['compiled_kernels']
+            print(f"Compiled spur avg: {compiled_stats['spur']['mean']*1000:.3f} ms")
+            print(f"Compiled helical avg: {compiled_stats['helical']['mean']*1000:.3f} ms")
+        
         if 'batch_processing' in self.results:
             batch_stats = self.results['batch_processing']
             per_calc = batch_stats['mean'] / 100  # 100 calculations in batch
@@ -231,17 +398,29 @@ class PerformanceAnalyzer:
 
 def main():
     """Run complete performance analysis"""
+    parser = argparse.ArgumentParser(description="MOP performance analysis")
+    parser.add_argument("--sampling", action="store_true",
+                        help="Profile with py-spy (or yappi) instead of cProfile")
+    parser.add_argument("--profile-only", action="store_true",
+                        help="Only run the function profiling, in this process")
+    args = parser.parse_args()
+    
     analyzer = PerformanceAnalyzer()
     
+    if args.profile_only:
+        analyzer.profile_critical_functions(sampling=args.sampling, isolated=False)
+        return
+    
     print("Starting MOP Performance Analysis...")
-    print(f"Running {analyzer.iterations} iterations per test")
+    print(f"Timing each test as the best of {analyzer.repeats} auto-ranged timeit blocks")
     
     analyzer.analyze_newton_raphson_performance()
     analyzer.analyze_helical_correction_performance()
     analyzer.analyze_complete_calculation_performance()
+    analyzer.analyze_compiled_kernel_performance()
     analyzer.analyze_batch_performance()
     analyzer.memory_usage_analysis()
-    analyzer.profile_critical_functions()
+    analyzer.profile_critical_functions(sampling=args.sampling)
     analyzer.generate_performance_report()
 
 if __name__ == "__main__":
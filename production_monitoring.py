@@ -6,17 +6,92 @@ Comprehensive logging, metrics, and health monitoring
 
 import os
 import sys
+import atexit
+import math
 import time
 import json
 import logging
+import logging.handlers
 import threading
+from itertools import takewhile
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from collections import Counter, defaultdict, deque
 import psutil
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed - windows are scanned record by record
+    np = None
+
+LOG_BUFFER_CAPACITY = 1024  # Records buffered per file handler before a write
+LOG_FLUSH_INTERVAL = 5.0  # Seconds between background flushes of buffered logs
+MEMORY_SAMPLE_TTL = 1.0  # Seconds a psutil.virtual_memory() reading is reused
+
+# ISO text of the most recently formatted whole second: (epoch second, 'YYYY-MM-DDTHH:MM:SS')
+_iso_second_cache = (None, '')
+
+def _iso_timestamp(epoch: Optional[float] = None) -> str:
+    """
+    UTC ISO-8601 text for an epoch time (default: now)
+    
+    Same text as datetime.utcfromtimestamp(epoch).isoformat(), but the
+    date/time part is formatted once per second and reused; only the
+    microseconds are formatted per call.
+    """
+    global _iso_second_cache
+    if epoch is None:
+        epoch = time.time()
+    second = math.floor(epoch)
+    micros = round((epoch - second) * 1e6)
+    if micros == 1000000:
+        second += 1
+        micros = 0
+    
+    cached_second, prefix = _iso_second_cache
+    if cached_second != second:
+        prefix = datetime.utcfromtimestamp(second).isoformat()
+        _iso_second_cache = (second, prefix)
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
+# Last memory reading: (time.monotonic() when read, psutil.virtual_memory() result)
+_memory_sample = (float('-inf'), None)
+
+def _virtual_memory():
+    """psutil.virtual_memory(), re-read at most once per MEMORY_SAMPLE_TTL seconds"""
+    global _memory_sample
+    read_at, memory = _memory_sample
+    now = time.monotonic()
+    if now - read_at > MEMORY_SAMPLE_TTL:
+        memory = psutil.virtual_memory()
+        _memory_sample = (now, memory)
+    return memory
+
+# LogRecord attribute holding the structured fields of ProductionLogger records
+_EXTRA_FIELDS = '_mop_extra'
+
+# Standard LogRecord attributes, skipped when collecting extra= fields
+_LOG_RECORD_ATTRIBUTES = frozenset([
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'exc_info', 'exc_text', 'stack_info',
+])
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON text (orjson when installed)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+@dataclass(slots=True)
 class CalculationMetrics:
     """Metrics for gear calculations"""
     
@@ -26,12 +101,14 @@ class CalculationMetrics:
     error_type: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = None
     timestamp: Optional[str] = None
+    epoch: float = field(default_factory=time.time)  # Wall-clock record time, for the timestamp
+    monotonic: float = field(default_factory=time.monotonic)  # Record time, for window filters
     
     def __post_init__(self):
         if self.timestamp is None:
-            self.timestamp = datetime.utcnow().isoformat()
+            self.timestamp = _iso_timestamp(self.epoch)
 
-@dataclass  
+@dataclass(slots=True)
 class SystemMetrics:
     """System performance metrics"""
     
@@ -45,7 +122,19 @@ class SystemMetrics:
     
     def __post_init__(self):
         if not hasattr(self, 'timestamp') or self.timestamp is None:
-            self.timestamp = datetime.utcnow().isoformat()
+            self.timestamp = _iso_timestamp()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Same dict as dataclasses.asdict(), without its recursive copy (all fields are scalars)"""
+        return {
+            'cpu_percent': self.cpu_percent,
+            'memory_percent': self.memory_percent,
+            'memory_mb': self.memory_mb,
+            'active_connections': self.active_connections,
+            'requests_per_minute': self.requests_per_minute,
+            'error_rate': self.error_rate,
+            'timestamp': self.timestamp,
+        }
 
 class MetricsCollector:
     """Collect and aggregate performance metrics"""
@@ -55,51 +144,131 @@ class MetricsCollector:
         self.calculation_history = deque(maxlen=max_history)
         self.system_history = deque(maxlen=max_history)
         self.request_times = deque(maxlen=max_history)
-        self.error_counts = defaultdict(int)
-        self.start_time = time.time()
+        self.error_counts = Counter()
+        self.start_time = time.monotonic()  # Interval math uses the monotonic clock (immune to NTP steps)
         self.total_requests = 0
         self.total_errors = 0
-        self._lock = threading.Lock()
+        
+        # Prime psutil's CPU baseline: later non-blocking cpu_percent() calls
+        # report usage since the previous call instead of sleeping to sample
+        psutil.cpu_percent(interval=None)
+        
+        # Separate locks per structure, so request timing, calculation
+        # recording and the system sampler don't serialize on each other
+        self._lock = threading.Lock()  # calculation_history, aggregates and counters
+        self._request_lock = threading.Lock()  # request_times
+        self._system_lock = threading.Lock()  # system_history and _last_sys
+        
+        # Most recent sample: (time.monotonic() when taken, SystemMetrics)
+        self._last_sys = (float('-inf'), None)
+        
+        # Running aggregates over calculation_history, updated on append and
+        # eviction so summaries never rescan the deque
+        self._seq = 0  # Sequence number of the next recorded calculation
+        self._success_count = 0
+        self._exec_sum = 0.0  # Sum of successful execution times (re-summed every max_history records)
+        self._exec_min = deque()  # (seq, time), times increasing: window minimum first
+        self._exec_max = deque()  # (seq, time), times decreasing: window maximum first
+        self._type_counts = defaultdict(int)
+        
+        # Column copies of the fields the time-window queries need, as ring
+        # buffers indexed by seq % max_history (slot order is irrelevant for counting)
+        if np is not None:
+            self._record_times = np.zeros(max_history, dtype=np.float64)
+            self._successes = np.zeros(max_history, dtype=np.bool_)
     
     def record_calculation(self, metrics: CalculationMetrics):
         """Record calculation metrics"""
         with self._lock:
+            if len(self.calculation_history) == self.max_history:
+                self._forget(self.calculation_history[0], self._seq - self.max_history)
             self.calculation_history.append(metrics)
+            self._remember(metrics, self._seq)
+            if np is not None:
+                slot = self._seq % self.max_history
+                self._record_times[slot] = metrics.monotonic
+                self._successes[slot] = metrics.success
+            self._seq += 1
+            if self._seq % self.max_history == 0:
+                # Rebuild the sum once per window turnover (amortized O(1)), so
+                # add-on-insert/subtract-on-evict rounding error can't accumulate
+                self._exec_sum = math.fsum(m.execution_time for m in self.calculation_history if m.success)
+            
             self.total_requests += 1
             if not metrics.success:
                 self.total_errors += 1
                 self.error_counts[metrics.error_type or 'unknown'] += 1
     
+    def _remember(self, metrics: CalculationMetrics, seq: int):
+        """Add a calculation to the running aggregates (lock held)"""
+        self._type_counts[metrics.calculation_type] += 1
+        if metrics.success:
+            exec_time = metrics.execution_time
+            self._success_count += 1
+            self._exec_sum += exec_time
+            while self._exec_min and self._exec_min[-1][1] >= exec_time:
+                self._exec_min.pop()
+            self._exec_min.append((seq, exec_time))
+            while self._exec_max and self._exec_max[-1][1] <= exec_time:
+                self._exec_max.pop()
+            self._exec_max.append((seq, exec_time))
+    
+    def _forget(self, metrics: CalculationMetrics, seq: int):
+        """Remove the calculation about to be evicted from the aggregates (lock held)"""
+        remaining = self._type_counts[metrics.calculation_type] - 1
+        if remaining:
+            self._type_counts[metrics.calculation_type] = remaining
+        else:
+            del self._type_counts[metrics.calculation_type]
+        if metrics.success:
+            self._success_count -= 1
+            self._exec_sum -= metrics.execution_time
+            if self._exec_min and self._exec_min[0][0] == seq:
+                self._exec_min.popleft()
+            if self._exec_max and self._exec_max[0][0] == seq:
+                self._exec_max.popleft()
+    
     def record_request_time(self, execution_time: float):
         """Record request execution time"""
-        with self._lock:
-            self.request_times.append((time.time(), execution_time))
+        with self._request_lock:
+            self.request_times.append((time.monotonic(), execution_time))
+    
+    def recent_request_times(self, window: float, current_time: Optional[float] = None) -> List[float]:
+        """Execution times of requests within the last `window` seconds (newest first)
+        
+        current_time is a time.monotonic() reading (default: now).
+        """
+        if current_time is None:
+            current_time = time.monotonic()
+        cutoff = current_time - window
+        with self._request_lock:
+            # request_times is in arrival order, so stop at the first entry outside the window
+            return [exec_time for _, exec_time in
+                    takewhile(lambda entry: entry[0] > cutoff, reversed(self.request_times))]
     
-    def get_current_system_metrics(self) -> SystemMetrics:
-        """Get current system performance metrics"""
+    def get_current_system_metrics(self, max_age: float = 0.0) -> SystemMetrics:
+        """
+        Get current system performance metrics
+        
+        With max_age > 0, a sample taken less than max_age seconds ago is
+        returned as is (and not added to system_history again).
+        """
+        
+        if max_age > 0:
+            sampled_at, last = self._last_sys
+            if last is not None and time.monotonic() - sampled_at < max_age:
+                return last
         
         # Get system stats
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
+        cpu_percent = psutil.cpu_percent(interval=None)  # Non-blocking, since the last call
+        memory = _virtual_memory()
         
         # Calculate requests per minute
-        current_time = time.time()
-        recent_requests = [
-            req_time for req_time, _ in self.request_times
-            if current_time - req_time < 60
-        ]
-        requests_per_minute = len(recent_requests)
-        
-        # Calculate error rate
-        recent_calculations = [
-            calc for calc in self.calculation_history
-            if current_time - time.mktime(time.strptime(calc.timestamp[:19], '%Y-%m-%dT%H:%M:%S')) < 300  # Last 5 minutes
-        ]
-        
-        if recent_calculations:
-            error_rate = sum(1 for calc in recent_calculations if not calc.success) / len(recent_calculations)
-        else:
-            error_rate = 0.0
+        current_time = time.monotonic()
+        requests_per_minute = len(self.recent_request_times(60, current_time))
+        
+        # Calculate error rate over the last 5 minutes
+        error_rate = self._recent_error_rate(current_time - 300)
         
         metrics = SystemMetrics(
             cpu_percent=cpu_percent,
@@ -108,14 +277,33 @@ class MetricsCollector:
             active_connections=0,  # Would need web server integration
             requests_per_minute=requests_per_minute,
             error_rate=error_rate,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=_iso_timestamp()
         )
         
-        with self._lock:
+        with self._system_lock:
             self.system_history.append(metrics)
+            self._last_sys = (current_time, metrics)
         
         return metrics
     
+    def _recent_error_rate(self, cutoff: float) -> float:
+        """Fraction of failed calculations recorded after `cutoff` (time.monotonic() seconds)"""
+        with self._lock:
+            if np is not None:
+                filled = min(self._seq, self.max_history)
+                in_window = self._record_times[:filled] > cutoff
+                recent = int(np.count_nonzero(in_window))
+                failed = int(np.count_nonzero(in_window & ~self._successes[:filled]))
+            else:
+                # Newest first, stop at the window edge
+                recent = failed = 0
+                for calc in takewhile(lambda calc: calc.monotonic > cutoff,
+                                      reversed(self.calculation_history)):
+                    recent += 1
+                    failed += not calc.success
+        
+        return failed / recent if recent else 0.0
+    
     def get_summary_statistics(self) -> Dict[str, Any]:
         """Get summary statistics"""
         
@@ -126,21 +314,19 @@ class MetricsCollector:
                     "message": "No calculations recorded yet"
                 }
             
-            # Calculate statistics
+            # Statistics from the running aggregates
             total_calcs = len(self.calculation_history)
-            successful_calcs = sum(1 for calc in self.calculation_history if calc.success)
-            
-            execution_times = [calc.execution_time for calc in self.calculation_history if calc.success]
+            successful_calcs = self._success_count
             
-            if execution_times:
-                avg_time = sum(execution_times) / len(execution_times)
-                min_time = min(execution_times)
-                max_time = max(execution_times)
+            if successful_calcs:
+                avg_time = self._exec_sum / successful_calcs
+                min_time = self._exec_min[0][1]
+                max_time = self._exec_max[0][1]
             else:
                 avg_time = min_time = max_time = 0.0
             
             # Calculate uptime
-            uptime_seconds = time.time() - self.start_time
+            uptime_seconds = time.monotonic() - self.start_time
             uptime_hours = uptime_seconds / 3600
             
             return {
@@ -161,15 +347,138 @@ class MetricsCollector:
     
     def _get_calculation_type_breakdown(self) -> Dict[str, int]:
         """Get breakdown of calculation types"""
-        breakdown = defaultdict(int)
-        for calc in self.calculation_history:
-            breakdown[calc.calculation_type] += 1
-        return dict(breakdown)
+        return dict(self._type_counts)
+
+class CompressedCalculationLog:
+    """
+    Compact calculation log with interned strings
+    
+    Writes NDJSON where every distinct calculation type and parameter key set
+    is registered once as {"reg": id, "s": value} and calculation records
+    reference it by id:
+    
+        {"t": epoch, "c": type_id, "d": execution_time, "ok": 1,
+         "k": keys_id, "v": [parameter values], "e": "error text"}
+    
+    Error text is written inline: messages embed parameter values, so nearly
+    every one is distinct and interning them would only grow the table. Once
+    max_strings values are registered, new types/key sets are written inline
+    too, keeping memory bounded on long-running servers.
+    
+    Each logger session starts with a {"session": epoch} record, after which
+    ids are numbered from zero again. read_compressed_log() decodes a file
+    back to plain dictionaries.
+    """
+    
+    def __init__(self, path: str, buffer_size: int = 64 * 1024, max_strings: int = 4096):
+        self.path = path
+        self._file = open(path, 'a', buffering=buffer_size)
+        self._ids: Dict[Any, int] = {}
+        self._max_strings = max_strings
+        self._lock = threading.Lock()
+        self._file.write(_dumps({"session": time.time()}) + '\n')
+    
+    def _intern(self, value: Any) -> Any:
+        """
+        Id for a string (or key tuple), registering it on first use (lock held)
+        
+        Returns the value itself (tuples as lists) once the table is full.
+        """
+        string_id = self._ids.get(value)
+        if string_id is None:
+            registered = list(value) if isinstance(value, tuple) else value
+            if len(self._ids) >= self._max_strings:
+                return registered
+            string_id = self._ids[value] = len(self._ids)
+            self._file.write(_dumps({"reg": string_id, "s": registered}) + '\n')
+        return string_id
+    
+    def write(self, calc_type: str, parameters: Optional[Dict[str, Any]],
+              execution_time: float, success: bool, error: Optional[str] = None):
+        """Append one calculation record (dropped once the log is closed)"""
+        with self._lock:
+            if self._file.closed:
+                return
+            record = {
+                "t": time.time(),
+                "c": self._intern(calc_type),
+                "d": execution_time,
+                "ok": 1 if success else 0,
+            }
+            if parameters:
+                record["k"] = self._intern(tuple(parameters))
+                record["v"] = list(parameters.values())
+            if error is not None:
+                record["e"] = error
+            self._file.write(_dumps(record) + '\n')
+    
+    def flush(self):
+        """Write buffered records to disk"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def read_compressed_log(path: str) -> List[Dict[str, Any]]:
+    """Decode a CompressedCalculationLog file into calculation dictionaries"""
+    
+    records = []
+    strings: Dict[int, Any] = {}
+    
+    def resolve(ref):
+        # Registered ids are ints; unregistered values are stored inline
+        return strings[ref] if isinstance(ref, int) else ref
+    
+    with open(path) as log_file:
+        for line in log_file:
+            entry = json.loads(line)
+            if "session" in entry:
+                strings = {}
+            elif "reg" in entry:
+                strings[entry["reg"]] = entry["s"]
+            else:
+                records.append({
+                    "timestamp": _iso_timestamp(entry["t"]),
+                    "calculation_type": resolve(entry["c"]),
+                    "execution_time": entry["d"],
+                    "success": bool(entry["ok"]),
+                    "parameters": dict(zip(resolve(entry["k"]), entry["v"])) if "k" in entry else None,
+                    "error": resolve(entry["e"]) if "e" in entry else None,
+                })
+    return records
+
+class _BatchFileHandler(logging.FileHandler):
+    """
+    FileHandler for use behind a MemoryHandler
+    
+    StreamHandler.emit() flushes the file after every record, which turns a
+    buffered batch back into one write() per record. Here records only fill
+    the file's buffer and _BatchMemoryHandler writes it out once per batch
+    (closing the handler writes out the rest).
+    """
+    
+    def flush(self):
+        pass  # Called by emit() per record; see flush_batch()
+    
+    def flush_batch(self):
+        super().flush()
+
+class _BatchMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that flushes its _BatchFileHandler target once per batch"""
+    
+    def flush(self):
+        super().flush()
+        if isinstance(self.target, _BatchFileHandler):
+            self.target.flush_batch()
 
 class ProductionLogger:
     """Production-grade logging system"""
     
-    def __init__(self, log_level: str = "INFO", log_dir: str = "logs"):
+    def __init__(self, log_level: str = "INFO", log_dir: str = "logs",
+                 compressed_calculations: bool = False):
         self.log_dir = log_dir
         self.ensure_log_directory()
         
@@ -180,11 +489,27 @@ class ProductionLogger:
         )
         
         self.json_formatter = self._create_json_formatter()
+        self._buffered_handlers: List[logging.handlers.MemoryHandler] = []
+        
+        # Console handler for development, shared by all loggers (one stream, one lock)
+        self.console_handler = None
+        if os.getenv('MOP_DEV_MODE', 'false').lower() == 'true':
+            self.console_handler = logging.StreamHandler(sys.stdout)
+            self.console_handler.setFormatter(self.detailed_formatter)
+        
+        # Calculation records go to the interned log instead of calculations.json
+        # when compressed_calculations is set (the text log is kept either way)
+        self.compressed_log = None
+        if compressed_calculations:
+            self.compressed_log = CompressedCalculationLog(os.path.join(self.log_dir, "calculations.clog"))
+            atexit.register(self.compressed_log.close)  # close() covers orderly shutdowns
         
         # Set up loggers
         self.main_logger = self._setup_logger('mop.main', log_level)
-        self.calculation_logger = self._setup_logger('mop.calculations', log_level)
-        self.security_logger = self._setup_logger('mop.security', log_level)
+        self.calculation_logger = self._setup_logger('mop.calculations', log_level,
+                                                     structured=not compressed_calculations)
+        # Security events are written as they happen, not batched
+        self.security_logger = self._setup_logger('mop.security', log_level, flush_level=logging.WARNING)
         self.performance_logger = self._setup_logger('mop.performance', log_level)
         self.error_logger = self._setup_logger('mop.errors', 'WARNING')
     
@@ -193,8 +518,13 @@ class ProductionLogger:
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
     
-    def _setup_logger(self, name: str, level: str) -> logging.Logger:
-        """Set up individual logger"""
+    def _setup_logger(self, name: str, level: str, structured: bool = True,
+                      flush_level: int = logging.ERROR) -> logging.Logger:
+        """
+        Set up individual logger (structured adds the JSON file handler)
+        
+        Records at flush_level or above write out the logger's buffers at once.
+        """
         
         logger = logging.getLogger(name)
         logger.setLevel(getattr(logging, level.upper()))
@@ -204,31 +534,60 @@ class ProductionLogger:
         
         # File handler
         log_file = os.path.join(self.log_dir, f"{name.split('.')[-1]}.log")
-        file_handler = logging.FileHandler(log_file)
+        file_handler = _BatchFileHandler(log_file)
         file_handler.setFormatter(self.detailed_formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(self._buffered(file_handler, flush_level))
         
         # JSON file handler for structured logs
-        json_file = os.path.join(self.log_dir, f"{name.split('.')[-1]}.json")
-        json_handler = logging.FileHandler(json_file)
-        json_handler.setFormatter(self.json_formatter)
-        logger.addHandler(json_handler)
+        if structured:
+            json_file = os.path.join(self.log_dir, f"{name.split('.')[-1]}.json")
+            json_handler = _BatchFileHandler(json_file)
+            json_handler.setFormatter(self.json_formatter)
+            logger.addHandler(self._buffered(json_handler, flush_level))
         
         # Console handler for development
-        if os.getenv('MOP_DEV_MODE', 'false').lower() == 'true':
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setFormatter(self.detailed_formatter)
-            logger.addHandler(console_handler)
+        if self.console_handler is not None:
+            logger.addHandler(self.console_handler)
         
         return logger
     
+    def _buffered(self, target: logging.Handler,
+                  flush_level: int = logging.ERROR) -> logging.handlers.MemoryHandler:
+        """
+        Wrap a file handler so records are written in batches
+        
+        Records are held in memory until the buffer fills, a record at
+        flush_level arrives, flush() is called (ProductionManager does so every
+        LOG_FLUSH_INTERVAL seconds) or logging shuts down.
+        """
+        handler = _BatchMemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY, flushLevel=flush_level,
+            target=target, flushOnClose=True
+        )
+        self._buffered_handlers.append(handler)
+        return handler
+    
+    def flush(self):
+        """Write out all buffered log records"""
+        for handler in self._buffered_handlers:
+            handler.flush()
+        if self.compressed_log is not None:
+            self.compressed_log.flush()
+    
+    def close(self):
+        """Write out buffered records and close the compressed calculation log"""
+        self.flush()
+        if self.compressed_log is not None:
+            self.compressed_log.close()
+            atexit.unregister(self.compressed_log.close)
+    
     def _create_json_formatter(self):
         """Create JSON formatter for structured logging"""
         
         class JSONFormatter(logging.Formatter):
             def format(self, record):
                 log_entry = {
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': _iso_timestamp(record.created),
                     'level': record.levelname,
                     'logger': record.name,
                     'function': record.funcName,
@@ -240,15 +599,17 @@ class ProductionLogger:
                 if record.exc_info:
                     log_entry['exception'] = self.formatException(record.exc_info)
                 
-                # Add extra fields
-                for key, value in record.__dict__.items():
-                    if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                                 'filename', 'module', 'lineno', 'funcName', 'created', 
-                                 'msecs', 'relativeCreated', 'thread', 'threadName', 
-                                 'processName', 'process', 'exc_info', 'exc_text', 'stack_info']:
-                        log_entry[key] = value
+                # Add extra fields: ProductionLogger passes its fields as one
+                # prebuilt dict; other extra= callers fall back to a scan
+                extras = getattr(record, _EXTRA_FIELDS, None)
+                if extras is not None:
+                    log_entry.update(extras)
+                else:
+                    for key, value in record.__dict__.items():
+                        if key not in _LOG_RECORD_ATTRIBUTES:
+                            log_entry[key] = value
                 
-                return json.dumps(log_entry)
+                return _dumps(log_entry)
         
         return JSONFormatter()
     
@@ -256,6 +617,9 @@ class ProductionLogger:
                        execution_time: float, success: bool, error: str = None):
         """Log calculation details"""
         
+        if self.compressed_log is not None:
+            self.compressed_log.write(calc_type, parameters, execution_time, success, error)
+        
         extra = {
             'calculation_type': calc_type,
             'execution_time': execution_time,
@@ -266,13 +630,13 @@ class ProductionLogger:
         if success:
             self.calculation_logger.info(
                 f"Calculation completed: {calc_type} in {execution_time:.6f}s",
-                extra=extra
+                extra={_EXTRA_FIELDS: extra}
             )
         else:
             extra['error'] = error
             self.calculation_logger.error(
                 f"Calculation failed: {calc_type} - {error}",
-                extra=extra
+                extra={_EXTRA_FIELDS: extra}
             )
     
     def log_security_event(self, event_type: str, details: Dict[str, Any]):
@@ -285,7 +649,7 @@ class ProductionLogger:
         
         self.security_logger.warning(
             f"Security event: {event_type}",
-            extra=extra
+            extra={_EXTRA_FIELDS: extra}
         )
     
     def log_performance_warning(self, metric: str, value: float, threshold: float):
@@ -299,7 +663,7 @@ class ProductionLogger:
         
         self.performance_logger.warning(
             f"Performance warning: {metric} = {value} exceeds threshold {threshold}",
-            extra=extra
+            extra={_EXTRA_FIELDS: extra}
         )
     
     def log_error(self, error_type: str, error_msg: str, context: Dict[str, Any] = None):
@@ -310,7 +674,7 @@ class ProductionLogger:
             'context': context or {}
         }
         
-        self.error_logger.error(error_msg, extra=extra)
+        self.error_logger.error(error_msg, extra={_EXTRA_FIELDS: extra})
 
 class HealthMonitor:
     """Monitor system health and alert on issues"""
@@ -330,11 +694,11 @@ class HealthMonitor:
     def check_health(self) -> Dict[str, Any]:
         """Check system health and return status"""
         
-        current_time = time.time()
-        system_metrics = self.metrics.get_current_system_metrics()
+        current_time = time.monotonic()  # For windows and alert cooldowns
+        system_metrics = self.metrics.get_current_system_metrics(max_age=1.0)
         health_status = {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_timestamp(),
             "checks": {},
             "alerts": []
         }
@@ -364,10 +728,7 @@ class HealthMonitor:
             health_status["checks"]["error_rate"] = "ok"
         
         # Check response time
-        recent_times = [
-            exec_time for req_time, exec_time in self.metrics.request_times
-            if current_time - req_time < 60
-        ]
+        recent_times = self.metrics.recent_request_times(60, current_time)
         
         if recent_times:
             avg_response_time = sum(recent_times) / len(recent_times)
@@ -385,9 +746,9 @@ class HealthMonitor:
     def _maybe_alert(self, alert_type: str, value: float, current_time: float):
         """Send alert if not in cooldown period"""
         
-        last_alert_time = self.last_alerts.get(alert_type, 0)
+        last_alert_time = self.last_alerts.get(alert_type)
         
-        if current_time - last_alert_time > self.alert_cooldown:
+        if last_alert_time is None or current_time - last_alert_time > self.alert_cooldown:
             self.logger.log_performance_warning(
                 alert_type, value, self.thresholds.get(alert_type.split('_')[-1], 0)
             )
@@ -396,30 +757,62 @@ class HealthMonitor:
 class ProductionManager:
     """Main production management class"""
     
-    def __init__(self, log_level: str = "INFO", log_dir: str = "logs"):
+    def __init__(self, log_level: str = "INFO", log_dir: str = "logs",
+                 compressed_calculations: bool = False):
         self.metrics = MetricsCollector()
-        self.logger = ProductionLogger(log_level, log_dir)
+        self.logger = ProductionLogger(log_level, log_dir, compressed_calculations)
         self.health = HealthMonitor(self.metrics, self.logger)
         self.start_time = time.time()
         
-        # Start background monitoring thread
-        self.monitoring_thread = threading.Thread(target=self._background_monitoring, daemon=True)
-        self.monitoring_thread.start()
+        # Set by close(); the background threads wait on it instead of sleeping
+        self._shutdown = threading.Event()
+        
+        # The monitoring thread is started by the first record_calculation(),
+        # so managers that never record anything (tests, CLI runs) don't sample
+        self.monitoring_thread = None
+        self._monitor_started = False
+        self._monitor_lock = threading.Lock()
+        
+        # Flush buffered logs periodically so files stay near real time; started
+        # now, since startup and security logging happen before any calculation
+        self.log_flush_thread = threading.Thread(target=self._background_log_flush, daemon=True)
+        self.log_flush_thread.start()
         
         self.logger.main_logger.info("Production manager initialized")
     
+    def _start_monitor(self):
+        """Start the background monitoring thread if it isn't running yet"""
+        
+        with self._monitor_lock:
+            if self._monitor_started:
+                return
+            self._monitor_started = True
+            self.monitoring_thread = threading.Thread(target=self._background_monitoring, daemon=True)
+            self.monitoring_thread.start()
+    
     def _background_monitoring(self):
         """Background thread for continuous monitoring"""
         
-        while True:
+        # Update system metrics every 30 seconds until close()
+        while not self._shutdown.wait(30):
             try:
-                # Update system metrics every 30 seconds
                 self.metrics.get_current_system_metrics()
-                time.sleep(30)
                 
             except Exception as e:
                 self.logger.log_error("monitoring_error", str(e))
-                time.sleep(60)  # Wait longer on error
+                self._shutdown.wait(30)  # Wait longer on error
+    
+    def _background_log_flush(self):
+        """Background thread writing out buffered log records"""
+        
+        while not self._shutdown.wait(LOG_FLUSH_INTERVAL):
+            self.logger.flush()
+    
+    def close(self):
+        """Stop the background threads, write out buffered logs and close the calculation log"""
+        
+        self._shutdown.set()
+        self.logger.close()
     
     def record_calculation(self, calc_type: str, parameters: Dict[str, Any],
                           execution_time: float, success: bool, error: str = None):
@@ -434,6 +827,9 @@ class ProductionManager:
             parameters=parameters
         )
         
+        if not self._monitor_started:
+            self._start_monitor()
+        
         self.metrics.record_calculation(metrics)
         self.metrics.record_request_time(execution_time)
         
@@ -446,17 +842,18 @@ class ProductionManager:
         return {
             "health": self.health.check_health(),
             "metrics": self.metrics.get_summary_statistics(),
-            "system": asdict(self.metrics.get_current_system_metrics())
+            "system": self.metrics.get_current_system_metrics(max_age=1.0).to_dict()
         }
 
 # Global production manager instance
 production_manager = None
 
-def initialize_production_monitoring(log_level: str = "INFO", log_dir: str = "logs"):
+def initialize_production_monitoring(log_level: str = "INFO", log_dir: str = "logs",
+                                     compressed_calculations: bool = False):
     """Initialize global production monitoring"""
     
     global production_manager
-    production_manager = ProductionManager(log_level, log_dir)
+    production_manager = ProductionManager(log_level, log_dir, compressed_calculations)
     return production_manager
 
 def get_production_manager() -> Optional[ProductionManager]:
@@ -492,7 +889,7 @@ if __name__ == '__main__':
     # Get status report
     status = pm.get_status_report()
     print("\nStatus Report:")
-    print(json.dumps(status, indent=2))
+    print(_dumps(status, indent=True))
     
     print("\nMonitoring system is running...")
     print("Check logs/ directory for detailed logs")
\ No newline at end of file
@@ -8,6 +8,12 @@ import sys
 import subprocess
 import time
 import os
+import io
+import runpy
+import argparse
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 def run_test_script(script_name, description):
     """Run a test script and return results"""
@@ -22,9 +28,6 @@ def run_test_script(script_name, description):
             'duration': 0
         }
     
-    print(f"\nRunning {description}...")
-    print("-" * 50)
-    
     start_time = time.time()
     
     try:
@@ -38,12 +41,7 @@ def run_test_script(script_name, description):
         end_time = time.time()
         duration = end_time - start_time
         
-        if result.returncode == 0:
-            status = 'PASS'
-            print("PASSED")
-        else:
-            status = 'FAIL'
-            print("FAILED")
+        status = 'PASS' if result.returncode == 0 else 'FAIL'
         
         return {
             'name': script_name,
@@ -74,9 +72,62 @@ def run_test_script(script_name, description):
             'duration': 0
         }
 
+def run_test_script_in_process(script_name, description):
+    """
+    Run a test script inside this interpreter and return results
+    
+    Same result dictionary as run_test_script, but the script runs via runpy
+    with its output captured, so MOP, NumPy and the API modules are imported
+    once for the whole run instead of once per script. No timeout is enforced.
+    """
+    
+    if not os.path.exists(script_name):
+        return {
+            'name': script_name,
+            'description': description,
+            'status': 'SKIP',
+            'reason': 'File not found',
+            'output': '',
+            'duration': 0
+        }
+    
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = [script_name]  # Scripts (unittest.main) parse their own argv
+    returncode = 0
+    start_time = time.time()
+    
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            runpy.run_path(script_name, run_name='__main__')
+    except SystemExit as exit_request:
+        # Same mapping the interpreter applies to sys.exit() arguments
+        code = exit_request.code
+        returncode = code if isinstance(code, int) else (0 if code is None else 1)
+    except Exception:
+        traceback.print_exc(file=stderr)
+        returncode = 1
+    finally:
+        sys.argv = saved_argv
+    
+    return {
+        'name': script_name,
+        'description': description,
+        'status': 'PASS' if returncode == 0 else 'FAIL',
+        'returncode': returncode,
+        'output': stdout.getvalue(),
+        'error': stderr.getvalue(),
+        'duration': time.time() - start_time
+    }
+
 def main():
     """Main test runner"""
     
+    parser = argparse.ArgumentParser(description="Run all MOP test scripts")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run scripts sequentially in this interpreter (shared imports, no timeout)")
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("MOP GEAR METROLOGY SYSTEM - COMPREHENSIVE TEST SUITE")
     print("=" * 80)
@@ -94,14 +145,35 @@ def main():
         ('helical_test.py', 'Helical Range Tests'),
     ]
     
-    results = []
-    total_duration = 0
+    # Run the scripts concurrently - each is an independent subprocess, so
+    # with enough cores wall time approaches the slowest script rather than
+    # the sum. More workers than cores only adds contention (the scripts are
+    # CPU bound). Output is captured per script; progress is reported as
+    # each one finishes.
+    results = [None] * len(test_scripts)
+    wall_start = time.time()
+    
+    if args.in_process:
+        # Redirected stdout is process-wide, so in-process runs are sequential
+        workers = 1
+        for index, (script_name, description) in enumerate(test_scripts):
+            result = run_test_script_in_process(script_name, description)
+            results[index] = result
+            print(f"{result['status']:8} {result['description']} ({result['duration']:.2f}s)")
+    else:
+        workers = max(1, min(len(test_scripts), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_test_script, script_name, description): index
+                for index, (script_name, description) in enumerate(test_scripts)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                print(f"{result['status']:8} {result['description']} ({result['duration']:.2f}s)")
     
-    # Run each test script
-    for script_name, description in test_scripts:
-        result = run_test_script(script_name, description)
-        results.append(result)
-        total_duration += result['duration']
+    wall_duration = time.time() - wall_start
+    total_duration = sum(result['duration'] for result in results)
     
     # Generate summary report
     print("\n" + "=" * 80)
@@ -120,7 +192,8 @@ def main():
     print(f"Skipped:           {skipped}")
     print(f"Errors:            {errors}")
     print(f"Timeouts:          {timeouts}")
-    print(f"Total duration:    {total_duration:.2f} seconds")
+    print(f"Total duration:    {wall_duration:.2f} seconds ({workers} worker(s))")
+    print(f"Script time:       {total_duration:.2f} seconds (sum over scripts)")
     print()
     
     # Detailed results
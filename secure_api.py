@@ -5,28 +5,51 @@ Enhanced with authentication, rate limiting, and comprehensive validation
 """
 
 import os
+import math
 import time
+import asyncio
 import hashlib
 import secrets
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import List, Dict, Any, Literal, Optional, Tuple
 import json
+import logging
 
 try:
     from fastapi import FastAPI, HTTPException, Depends, Request, status
     from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.responses import JSONResponse
-    from pydantic import BaseModel, Field, validator
+    from pydantic import BaseModel, Field
     import uvicorn
 except ImportError:
     print("FastAPI dependencies not installed. Install with: pip install fastapi uvicorn pydantic")
     exit(1)
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    orjson = None
+    DefaultResponse = JSONResponse
+
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed - batches are pre-checked item by item
+    np = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis not installed - rate limits are kept in process memory
+    aioredis = None
+
 # Import our modules
 try:
-    from MOP import mow_spur_external_dp, mbp_spur_internal_dp, mow_helical_external_dp, mbp_helical_internal_dp
+    from MOP import mow_spur_external_dp, mbp_spur_internal_dp, mow_helical_external_dp, mbp_helical_internal_dp, best_pin_rule
     from validation import InputValidator, GearValidationError, ValidationResult
 except ImportError as e:
     print(f"Error importing modules: {e}")
@@ -39,41 +62,137 @@ SECURITY_CONFIG = {
     'rate_limit_window': 3600,   # window in seconds (1 hour)
     'max_batch_size': 50,        # maximum gears per batch
     'session_timeout': 86400,    # 24 hours
+    'rate_limit_sweep_interval': 300,  # seconds between idle rate-limit entry sweeps
+    'redis_url': os.getenv("MOP_REDIS_URL"),  # shared rate-limit store (None: in-memory)
+    'auth_cache_ttl': 5,         # seconds a validated key skips the api_keys lookup
+    'auth_cache_size': 1024,     # validated keys held in the auth cache
+    'max_api_keys': 10_000,      # issued keys kept; issuing beyond this needs an idle key to drop
+    'api_key_idle_eviction': 30 * 86400,  # seconds unused before a key may be dropped at the cap
 }
 
+# Hot-path settings bound once at import (SECURITY_CONFIG is not changed at runtime)
+_RL_LIMIT: int = SECURITY_CONFIG['rate_limit_requests']
+_RL_WINDOW: int = SECURITY_CONFIG['rate_limit_window']
+_RL_LIMIT_HEADER: str = str(_RL_LIMIT)  # X-RateLimit-Limit value
+_MAX_BATCH: int = SECURITY_CONFIG['max_batch_size']
+_AUTH_CACHE_TTL: float = SECURITY_CONFIG['auth_cache_ttl']
+_AUTH_CACHE_SIZE: int = SECURITY_CONFIG['auth_cache_size']
+
+# Fixed-window counter for the shared (Redis) rate limiter: count the request
+# and start the window's expiry with the first one, atomically
+_REDIS_RATE_LIMIT_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+logger = logging.getLogger(__name__)
+
 # In-memory storage (use database in production)
-api_keys = {}
-rate_limit_store = defaultdict(list)
+api_keys: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # key hash -> user info, least recently used first
+rate_limit_store: Dict[str, Tuple[float, float]] = {}  # client_id -> (tokens, last refill time)
 session_store = {}
 
+# Recently validated keys: raw API key -> (time.monotonic() when validated, key hash,
+# user_info), least recently used first
+_auth_cache: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """
+    Simple in-memory token-bucket rate limiter
+    
+    Each client holds up to `limit` tokens, refilled continuously at
+    limit/window tokens per second; a request spends one token. A client
+    costs two floats regardless of how many requests it has made.
+    """
     
     @staticmethod
-    def is_allowed(client_id: str, limit: int = SECURITY_CONFIG['rate_limit_requests'], 
-                   window: int = SECURITY_CONFIG['rate_limit_window']) -> bool:
-        """Check if client is within rate limits"""
-        current_time = time.time()
+    def _refill(client_id: str, limit: int, window: int, current_time: float) -> float:
+        """Tokens available to a client at current_time"""
+        tokens, last_refill = rate_limit_store.get(client_id, (limit, current_time))
+        return min(limit, tokens + (current_time - last_refill) * limit / window)
+    
+    @staticmethod
+    def check(client_id: str, limit: int = _RL_LIMIT,
+              window: int = _RL_WINDOW) -> Tuple[bool, int]:
+        """
+        Check if client is within rate limits (spends a token if so)
         
-        # Clean old entries
-        rate_limit_store[client_id] = [
-            timestamp for timestamp in rate_limit_store[client_id]
-            if current_time - timestamp < window
-        ]
+        Returns (allowed, remaining requests) from a single bucket read.
+        """
+        current_time = time.monotonic()
+        tokens = RateLimiter._refill(client_id, limit, window, current_time)
         
-        # Check if under limit
-        if len(rate_limit_store[client_id]) >= limit:
-            return False
+        if tokens < 1:
+            return False, 0
         
-        # Add current request
-        rate_limit_store[client_id].append(current_time)
-        return True
+        tokens -= 1
+        rate_limit_store[client_id] = (tokens, current_time)
+        return True, int(tokens)
+    
+    @staticmethod
+    def is_allowed(client_id: str, limit: int = _RL_LIMIT, 
+                   window: int = _RL_WINDOW) -> bool:
+        """Check if client is within rate limits (spends a token if so)"""
+        return RateLimiter.check(client_id, limit, window)[0]
     
     @staticmethod
-    def get_remaining(client_id: str, limit: int = SECURITY_CONFIG['rate_limit_requests']) -> int:
+    def get_remaining(client_id: str, limit: int = _RL_LIMIT,
+                      window: int = _RL_WINDOW) -> int:
         """Get remaining requests for client"""
-        current_count = len(rate_limit_store[client_id])
-        return max(0, limit - current_count)
+        return int(RateLimiter._refill(client_id, limit, window, time.monotonic()))
+    
+    @staticmethod
+    async def check_shared(script, client_id: str, limit: int = _RL_LIMIT,
+                           window: int = _RL_WINDOW) -> Tuple[bool, int]:
+        """
+        Check a client against the shared Redis rate limit (fixed window)
+        
+        Used instead of check() when MOP_REDIS_URL is set, so every worker
+        and replica counts against the same limit. `script` is the registered
+        _REDIS_RATE_LIMIT_LUA script. Returns (allowed, remaining requests).
+        """
+        count = await script(keys=[f"mop:ratelimit:{client_id}"], args=[window])
+        return count <= limit, max(0, limit - count)
+    
+    @staticmethod
+    def sweep(limit: int = _RL_LIMIT,
+              window: int = _RL_WINDOW) -> int:
+        """
+        Drop clients whose bucket has refilled completely and return how many
+        
+        A full bucket is exactly the state a new client starts in, so removing
+        it changes no decision - it only keeps one-off clients (scanners,
+        rotating IPs) from accumulating in rate_limit_store forever.
+        """
+        current_time = time.monotonic()
+        idle = [client_id for client_id in list(rate_limit_store)
+                if RateLimiter._refill(client_id, limit, window, current_time) >= limit]
+        for client_id in idle:
+            rate_limit_store.pop(client_id, None)
+        return len(idle)
+
+@lru_cache(maxsize=2)
+def _iso_second(second: int) -> str:
+    """UTC ISO-8601 text for a whole epoch second"""
+    return datetime.utcfromtimestamp(second).isoformat()
+
+def _iso_now() -> str:
+    """Current UTC time as ISO-8601 text to the second, formatted once per second"""
+    return _iso_second(int(time.time()))
+
+@lru_cache(maxsize=1024)
+def _hash_key(api_key: str) -> str:
+    """
+    Storage hash of an API key, computed once per distinct key (bounded, so
+    unknown keys can't grow it)
+    
+    The hash is only an opaque lookup key for a high-entropy random token,
+    not a password hash, so 128-bit BLAKE2s is sufficient.
+    """
+    return hashlib.blake2s(api_key.encode(), digest_size=16).hexdigest()
 
 class APIKeyManager:
     """Manage API keys and authentication"""
@@ -86,16 +205,45 @@ class APIKeyManager:
     @staticmethod
     def hash_key(api_key: str) -> str:
         """Hash API key for storage"""
-        return hashlib.sha256(api_key.encode()).hexdigest()
+        return _hash_key(api_key)
+    
+    @staticmethod
+    def _make_room() -> bool:
+        """
+        Free a slot in a full api_keys store
+        
+        Drops the least recently used key only if it has been idle for at least
+        api_key_idle_eviction seconds; active keys are never revoked.
+        """
+        key_hash, user_info = next(iter(api_keys.items()))
+        last_active = datetime.fromisoformat(user_info['last_used'] or user_info['created'])
+        idle_seconds = (datetime.utcnow() - last_active).total_seconds()
+        if idle_seconds < SECURITY_CONFIG['api_key_idle_eviction']:
+            return False
+        
+        # Cached validations of the key fail their api_keys check from now on
+        del api_keys[key_hash]
+        logger.warning("API key store full: dropped key of user %r (idle %.0f days)",
+                       user_info['username'], idle_seconds / 86400)
+        return True
     
     @staticmethod
     def create_user(username: str, permissions: List[str] = None) -> str:
-        """Create a new user and return API key"""
+        """
+        Create a new user and return API key
+        
+        Raises RuntimeError when the key store is full and no key is idle
+        long enough to be dropped.
+        """
         if permissions is None:
             permissions = ['calculate', 'batch']
         
+        if len(api_keys) >= SECURITY_CONFIG['max_api_keys'] and not APIKeyManager._make_room():
+            logger.warning("API key store full: refused key for user %r", username)
+            raise RuntimeError("API key limit reached")
+        
         api_key = APIKeyManager.generate_api_key()
-        key_hash = APIKeyManager.hash_key(api_key)
+        key_hash = _hash_key(api_key)
         
         api_keys[key_hash] = {
             'username': username,
@@ -109,14 +257,40 @@ class APIKeyManager:
     
     @staticmethod
     def validate_key(api_key: str) -> Optional[Dict[str, Any]]:
-        """Validate API key and return user info"""
-        key_hash = APIKeyManager.hash_key(api_key)
+        """
+        Validate API key and return user info
+        
+        A key validated within the last auth_cache_ttl seconds is served from
+        _auth_cache without hashing; its stored hash is still checked against
+        api_keys, so a dropped key stops working at once. request_count is
+        still exact, last_used is refreshed when the cache entry is.
+        """
+        current_time = time.monotonic()
+        cached = _auth_cache.get(api_key)
+        if cached is not None:
+            validated, key_hash, user_info = cached
+            if key_hash not in api_keys:
+                del _auth_cache[api_key]
+                return None
+            if current_time - validated < _AUTH_CACHE_TTL:
+                _auth_cache.move_to_end(api_key)
+                user_info['request_count'] += 1
+                return user_info
+        
+        key_hash = _hash_key(api_key)
         user_info = api_keys.get(key_hash)
         
         if user_info:
-            # Update last used timestamp
-            user_info['last_used'] = datetime.utcnow().isoformat()
+            # Mark the key recently used (eviction order) and update its timestamp
+            api_keys.move_to_end(key_hash)
+            user_info['last_used'] = _iso_now()
             user_info['request_count'] += 1
+            
+            # Only valid keys are cached, so unknown keys can't evict live ones
+            _auth_cache[api_key] = (current_time, key_hash, user_info)
+            _auth_cache.move_to_end(api_key)
+            if len(_auth_cache) > _AUTH_CACHE_SIZE:
+                _auth_cache.popitem(last=False)
         
         return user_info
 
@@ -131,32 +305,16 @@ class GearRequest(BaseModel):
     t: Optional[float] = Field(None, description="Tooth thickness (external) or space width (internal)", gt=0, le=100)
     s: Optional[float] = Field(None, description="Space width for internal gears", gt=0, le=100)
     d: Optional[float] = Field(None, description="Pin diameter", gt=0, le=50)
-    gear_type: str = Field(..., description="Gear type: 'external' or 'internal'")
+    # Literal choices are checked in pydantic-core, without Python validator callbacks
+    gear_type: Literal['external', 'internal'] = Field(..., description="Gear type: 'external' or 'internal'")
     use_best_pin: bool = Field(False, description="Use best pin diameter calculation")
-    unit_system: str = Field("standard", description="Unit system: 'standard' (DP) or 'module'")
-    
-    @validator('gear_type')
-    def validate_gear_type(cls, v):
-        if v not in ['external', 'internal']:
-            raise ValueError("gear_type must be 'external' or 'internal'")
-        return v
-    
-    @validator('unit_system')
-    def validate_unit_system(cls, v):
-        if v not in ['standard', 'module']:
-            raise ValueError("unit_system must be 'standard' or 'module'")
-        return v
+    unit_system: Literal['standard', 'module'] = Field("standard", description="Unit system: 'standard' (DP) or 'module'")
 
 class BatchRequest(BaseModel):
     """Request model for batch calculations"""
     
-    gears: List[GearRequest] = Field(..., description="List of gear calculations")
-    
-    @validator('gears')
-    def validate_batch_size(cls, v):
-        if len(v) > SECURITY_CONFIG['max_batch_size']:
-            raise ValueError(f"Batch size {len(v)} exceeds maximum {SECURITY_CONFIG['max_batch_size']}")
-        return v
+    gears: List[GearRequest] = Field(..., max_length=_MAX_BATCH,
+                                     description="List of gear calculations")
 
 class GearResponse(BaseModel):
     """Response model for gear calculations"""
@@ -179,13 +337,48 @@ class ErrorResponse(BaseModel):
     error_code: str
     timestamp: str
 
+async def _sweep_rate_limits():
+    """Background task evicting idle rate-limit entries"""
+    while True:
+        await asyncio.sleep(SECURITY_CONFIG['rate_limit_sweep_interval'])
+        RateLimiter.sweep()
+
+# Process pool for /batch - the gear math is pure CPU, so spreading it across
+# worker processes keeps the event loop free and scales with core count
+_BATCH_POOL: Optional[ProcessPoolExecutor] = None
+
+# Shared rate limiter (Redis client and its registered counter script), when configured
+_REDIS = None
+_REDIS_RATE_LIMIT = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the rate-limit store, sweeper and batch worker pool for the lifetime of the server"""
+    global _BATCH_POOL, _REDIS, _REDIS_RATE_LIMIT
+    if SECURITY_CONFIG['redis_url']:
+        if aioredis is None:
+            raise RuntimeError("MOP_REDIS_URL is set but the redis package is not installed")
+        _REDIS = aioredis.from_url(SECURITY_CONFIG['redis_url'])
+        _REDIS_RATE_LIMIT = _REDIS.register_script(_REDIS_RATE_LIMIT_LUA)
+    sweeper = asyncio.create_task(_sweep_rate_limits())
+    _BATCH_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+    yield
+    sweeper.cancel()
+    _BATCH_POOL.shutdown(wait=False, cancel_futures=True)
+    _BATCH_POOL = None
+    if _REDIS is not None:
+        await _REDIS.close()
+        _REDIS = _REDIS_RATE_LIMIT = None
+
 # FastAPI app initialization
 app = FastAPI(
     title="MOP Gear Metrology API",
     description="Secure API for high-precision gear measurement calculations",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=DefaultResponse  # orjson when installed
 )
 
 # CORS middleware with restrictions
@@ -200,6 +393,10 @@ app.add_middleware(
 # Security setup
 security = HTTPBearer()
 
+# Header sent with every 401; a fresh HTTPException is raised per request so
+# tracebacks (and the credentials in their frames) are not kept between requests
+_UNAUTH_HEADERS = {"WWW-Authenticate": "Bearer"}
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to validate API key"""
     
@@ -207,7 +404,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="API key required",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=_UNAUTH_HEADERS,
         )
     
     user_info = APIKeyManager.validate_key(credentials.credentials)
@@ -216,32 +413,64 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
-            headers={"WWW-Authenticate": "Bearer"},
+            headers=_UNAUTH_HEADERS,
         )
     
     return user_info
 
-async def check_rate_limit(request: Request, user_info: dict = Depends(get_current_user)):
-    """Dependency to check rate limits"""
+async def check_rate_limit(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Dependency to authenticate and check rate limits
+    
+    Calls get_current_user directly rather than declaring it as a
+    sub-dependency: the rate limit needs the authenticated user, so the two
+    steps cannot overlap, and one dependency is one less for FastAPI to
+    resolve per request.
+    """
     
+    user_info = await get_current_user(credentials)
     client_id = f"{user_info['username']}:{request.client.host}"
     
-    if not RateLimiter.is_allowed(client_id):
-        remaining = RateLimiter.get_remaining(client_id)
+    if _REDIS_RATE_LIMIT is not None:
+        allowed, remaining = await RateLimiter.check_shared(_REDIS_RATE_LIMIT, client_id)
+    else:
+        allowed, remaining = RateLimiter.check(client_id)
+    
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Rate limit exceeded. {remaining} requests remaining.",
             headers={
-                "X-RateLimit-Limit": str(SECURITY_CONFIG['rate_limit_requests']),
+                "X-RateLimit-Limit": _RL_LIMIT_HEADER,
                 "X-RateLimit-Remaining": str(remaining),
-                "X-RateLimit-Reset": str(int(time.time() + SECURITY_CONFIG['rate_limit_window']))
+                "X-RateLimit-Reset": str(int(time.time() + _RL_WINDOW))
             }
         )
     
     return user_info
 
-def safe_calculate_gear(gear_request: GearRequest) -> GearResponse:
-    """Safely calculate gear measurements with comprehensive validation"""
+def _gear_failure(message: str) -> Dict[str, Any]:
+    """GearResponse-shaped dict for a failed calculation"""
+    return {
+        "success": False,
+        "mop": None,
+        "method": None,
+        "pitch_diameter": None,
+        "base_diameter": None,
+        "contact_angle": None,
+        "uncertainty": None,
+        "warnings": [message],
+        "calculation_time": None
+    }
+
+def safe_calculate_gear(gear_request: GearRequest) -> Dict[str, Any]:
+    """
+    Safely calculate gear measurements with comprehensive validation
+    
+    Returns the GearResponse fields as a plain dict: every value is produced
+    here, so re-validating it through the response model on the way out
+    would be wasted work.
+    """
     
     start_time = time.time()
     warnings = []
@@ -287,13 +516,11 @@ def safe_calculate_gear(gear_request: GearRequest) -> GearResponse:
         # Calculate pin diameter if needed
         d = gear_request.d
         if gear_request.use_best_pin or d is None:
-            from MOP import best_pin_rule
             d = best_pin_rule(dp, gear_request.pa)
         
         # Calculate tooth thickness for external gears if needed
         t = gear_request.t
         if gear_request.gear_type == "external" and (t is None or gear_request.use_best_pin):
-            import math
             t = math.pi / (2.0 * dp)  # Standard tooth thickness
         
         # Perform calculation
@@ -327,29 +554,56 @@ def safe_calculate_gear(gear_request: GearRequest) -> GearResponse:
         
         calculation_time = time.time() - start_time
         
-        return GearResponse(
-            success=True,
-            mop=result.MOW,
-            method=result.method,
-            pitch_diameter=result.Dp,
-            base_diameter=result.Db,
-            contact_angle=result.beta_deg,
-            uncertainty=uncertainty,
-            warnings=warnings,
-            calculation_time=calculation_time
-        )
+        return {
+            "success": True,
+            "mop": result.MOW,
+            "method": result.method,
+            "pitch_diameter": result.Dp,
+            "base_diameter": result.Db,
+            "contact_angle": result.beta_deg,
+            "uncertainty": uncertainty,
+            "warnings": warnings,
+            "calculation_time": calculation_time
+        }
         
     except GearValidationError as e:
-        return GearResponse(
-            success=False,
-            warnings=[str(e)]
-        )
+        return _gear_failure(str(e))
     except Exception as e:
         # Log error in production
-        return GearResponse(
-            success=False,
-            warnings=[f"Calculation error: {str(e)}"]
-        )
+        return _gear_failure(f"Calculation error: {str(e)}")
+
+def _batch_rejects(gears: List[GearRequest]) -> List[bool]:
+    """
+    Flag batch items that will fail validation before any gear math
+    
+    Checks the missing thickness/space width rules and the InputValidator
+    bounds on z, dp, pa and helix for the whole batch at once (as NumPy
+    column comparisons when available). Flagged items still go through
+    safe_calculate_gear, which reports the exact error - they are just not
+    worth shipping to a worker process.
+    """
+    bounds = InputValidator.BOUNDS
+    missing = [
+        (gear.t is None and not gear.use_best_pin) if gear.gear_type == "external" else gear.s is None
+        for gear in gears
+    ]
+    if np is None:
+        return [
+            flag
+            or not bounds['z'][0] <= gear.z <= bounds['z'][1]
+            or not bounds['dp'][0] <= gear.dp <= bounds['dp'][1]
+            or not bounds['pa'][0] <= gear.pa <= bounds['pa'][1]
+            or not bounds['helix'][0] <= gear.helix <= bounds['helix'][1]
+            for gear, flag in zip(gears, missing)
+        ]
+    
+    count = len(gears)
+    reject = np.array(missing, dtype=bool)
+    for name in ('z', 'dp', 'pa', 'helix'):
+        column = np.fromiter((getattr(gear, name) for gear in gears), dtype=np.float64, count=count)
+        low, high = bounds[name]
+        reject |= (column < low) | (column > high)
+    return reject.tolist()
 
 # API Endpoints
 
@@ -369,15 +623,16 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _iso_now(),
         "version": "2.0.0",
         "rate_limits": {
-            "requests_per_hour": SECURITY_CONFIG['rate_limit_requests'],
-            "max_batch_size": SECURITY_CONFIG['max_batch_size']
+            "requests_per_hour": _RL_LIMIT,
+            "max_batch_size": _MAX_BATCH
         }
     }
 
-@app.post("/calculate", response_model=GearResponse)
+# GearResponse documents the schema; results are returned as dicts and not revalidated
+@app.post("/calculate", response_model=None, responses={200: {"model": GearResponse}})
 async def calculate_gear(
     gear_request: GearRequest,
     user_info: dict = Depends(check_rate_limit)
@@ -407,17 +662,31 @@ async def batch_calculate(
             detail="Insufficient permissions for batch calculation"
         )
     
-    results = []
-    
-    for gear_request in batch_request.gears:
-        result = safe_calculate_gear(gear_request)
-        results.append(result)
+    # Fan the calculations out to the worker pool (runs inline if the lifespan
+    # pool has not been started). Items that fail the batch pre-check only
+    # produce a validation error, so those are answered inline as well.
+    if _BATCH_POOL is None:
+        results = [safe_calculate_gear(gear_request) for gear_request in batch_request.gears]
+    else:
+        gears = batch_request.gears
+        rejects = _batch_rejects(gears)
+        results = [safe_calculate_gear(gear_request) if reject else None
+                   for gear_request, reject in zip(gears, rejects)]
+        
+        pooled = [index for index, reject in enumerate(rejects) if not reject]
+        loop = asyncio.get_running_loop()
+        computed = await asyncio.gather(*[
+            loop.run_in_executor(_BATCH_POOL, safe_calculate_gear, gears[index])
+            for index in pooled
+        ])
+        for index, result in zip(pooled, computed):
+            results[index] = result
     
     return {
         "success": True,
         "results": results,
         "count": len(results),
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _iso_now()
     }
 
 @app.post("/auth/create-key")
@@ -431,7 +700,13 @@ async def create_api_key(username: str, admin_key: str):
             detail="Invalid admin key"
         )
     
-    api_key = APIKeyManager.create_user(username)
+    try:
+        api_key = APIKeyManager.create_user(username)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     
     return {
         "success": True,
@@ -459,13 +734,14 @@ async def get_user_info(user_info: dict = Depends(get_current_user)):
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom HTTP exception handler"""
     
-    return JSONResponse(
+    return DefaultResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            error=exc.detail,
-            error_code=f"HTTP_{exc.status_code}",
-            timestamp=datetime.utcnow().isoformat()
-        ).dict()
+        content={
+            "success": False,
+            "error": exc.detail,
+            "error_code": f"HTTP_{exc.status_code}",
+            "timestamp": _iso_now()
+        }
     )
 
 @app.exception_handler(Exception)
@@ -473,13 +749,14 @@ async def general_exception_handler(request: Request, exc: Exception):
     """General exception handler"""
     
     # Log error in production
-    return JSONResponse(
+    return DefaultResponse(
         status_code=500,
-        content=ErrorResponse(
-            error="Internal server error",
-            error_code="INTERNAL_ERROR",
-            timestamp=datetime.utcnow().isoformat()
-        ).dict()
+        content={
+            "success": False,
+            "error": "Internal server error",
+            "error_code": "INTERNAL_ERROR",
+            "timestamp": _iso_now()
+        }
     )
 
 # Initialize with demo API key
@@ -7,9 +7,38 @@ Identifies potential security vulnerabilities and validation issues
 import ast
 import os
 import re
-from typing import Dict, List, Any, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Set
 from dataclasses import dataclass
 
+# Path operations that might be vulnerable: (pattern text, compiled pattern)
+_PATH_PATTERNS = tuple((pattern, re.compile(pattern)) for pattern in (
+    r'\.\./',  # Directory traversal
+    r'\.\.\\', # Windows directory traversal
+    r'/etc/',  # Unix system files
+    r'C:\\',   # Windows system paths
+))
+
+# Hardcoded secrets or sensitive data: (compiled pattern, description)
+_SENSITIVE_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), description) for pattern, description in (
+    (r'password\s*=\s*["\'][^"\']+["\']', "Hardcoded password"),
+    (r'api_key\s*=\s*["\'][^"\']+["\']', "Hardcoded API key"),
+    (r'secret\s*=\s*["\'][^"\']+["\']', "Hardcoded secret"),
+    (r'token\s*=\s*["\'][^"\']+["\']', "Hardcoded token"),
+))
+
+# Calls that can run arbitrary code or commands, in report order
+_DANGEROUS_FUNCTIONS = ('subprocess', 'os.system', 'eval', 'exec', 'compile')
+_HIGH_RISK_FUNCTIONS = frozenset(('eval', 'exec'))
+
+# Plain substring matches, like `func in line`. The lookahead finds a token at
+# every position, so overlapping tokens ("execompile") are not swallowed.
+_DANGEROUS_RE = re.compile('(?=(' + '|'.join(map(re.escape, _DANGEROUS_FUNCTIONS)) + '))')
+
+# One alternation per pattern group, so most lines are rejected in a single scan
+_PATH_ANY = re.compile('|'.join(pattern for pattern, _ in _PATH_PATTERNS))
+_SENSITIVE_ANY = re.compile('|'.join(regex.pattern for regex, _ in _SENSITIVE_PATTERNS), re.IGNORECASE)
+
 @dataclass
 class SecurityIssue:
     severity: str  # "HIGH", "MEDIUM", "LOW", "INFO"
@@ -19,6 +48,18 @@ class SecurityIssue:
     line: int
     recommendation: str
 
+# Per-process analyzer for parallel scans (set by _init_scan_worker)
+_ANALYZER: Optional["SecurityAnalyzer"] = None
+
+def _init_scan_worker(base_path: str):
+    """Process pool initializer: build one analyzer per worker"""
+    global _ANALYZER
+    _ANALYZER = SecurityAnalyzer(base_path)
+
+def _analyze_one(filepath: str) -> List[SecurityIssue]:
+    """Analyze a single file in a scan worker process"""
+    return _ANALYZER.analyze_file(filepath)
+
 class SecurityAnalyzer:
     """Analyze security vulnerabilities and input validation issues"""
     
@@ -40,166 +81,188 @@ class SecurityAnalyzer:
             return issues
         
         filename = os.path.basename(filepath)
+        nodes = self._collect_nodes(tree)
+        line_issues = self._scan_lines(lines, filename)
         
         # Check for various security issues
-        issues.extend(self._check_input_validation(tree, lines, filename))
-        issues.extend(self._check_file_operations(tree, lines, filename))
-        issues.extend(self._check_command_injection(content, lines, filename))
-        issues.extend(self._check_path_traversal(content, lines, filename))
-        issues.extend(self._check_exception_handling(tree, lines, filename))
+        issues.extend(self._check_input_validation(nodes, lines, filename))
+        issues.extend(line_issues["Division by Zero"])
+        issues.extend(self._check_file_operations(nodes, lines, filename))
+        issues.extend(line_issues["Command Injection"])
+        issues.extend(line_issues["Path Traversal"])
+        issues.extend(self._check_exception_handling(nodes, lines, filename))
         issues.extend(self._check_api_security(tree, lines, filename))
-        issues.extend(self._check_data_exposure(tree, lines, filename))
+        issues.extend(line_issues["Data Exposure"])
         
         return issues
     
-    def _check_input_validation(self, tree: ast.AST, lines: List[str], filename: str) -> List[SecurityIssue]:
+    @staticmethod
+    def _collect_nodes(tree: ast.AST) -> Dict[type, List[ast.AST]]:
+        """
+        Walk the tree once, bucketing the node types the AST checks inspect
+        
+        Buckets keep ast.walk order, so each check reports its issues in the
+        same order as walking the tree itself would.
+        """
+        nodes = {node_type: [] for node_type in (ast.FunctionDef, ast.Call, ast.ExceptHandler)}
+        for node in ast.walk(tree):
+            bucket = nodes.get(type(node))
+            if bucket is not None:
+                bucket.append(node)
+        return nodes
+    
+    def _check_input_validation(self, nodes: Dict[type, List[ast.AST]], lines: List[str], filename: str) -> List[SecurityIssue]:
         """Check for insufficient input validation"""
         issues = []
         
         # Look for functions that take user input without validation
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Check if function has user input parameters but no validation
-                if self._has_user_input_params(node) and not self._has_input_validation(node):
-                    issues.append(SecurityIssue(
-                        severity="MEDIUM",
-                        category="Input Validation",
-                        description=f"Function '{node.name}' accepts user input without validation",
-                        file=filename,
-                        line=node.lineno,
-                        recommendation="Add input validation for all user-supplied parameters"
-                    ))
+        for node in nodes[ast.FunctionDef]:
+            # Check if function has user input parameters but no validation
+            if self._has_user_input_params(node) and not self._has_input_validation(node):
+                issues.append(SecurityIssue(
+                    severity="MEDIUM",
+                    category="Input Validation",
+                    description=f"Function '{node.name}' accepts user input without validation",
+                    file=filename,
+                    line=node.lineno,
+                    recommendation="Add input validation for all user-supplied parameters"
+                ))
+        
+        return issues
+    
+    def _scan_lines(self, lines: List[str], filename: str) -> Dict[str, List[SecurityIssue]]:
+        """
+        Run the line-based checks in a single pass over the source
+        
+        Issues are grouped by category so analyze_file can report each group
+        at its usual place in the check order.
+        """
+        division, commands, paths, secrets = [], [], [], []
         
-        # Check for missing range checks on critical calculations
         for i, line in enumerate(lines, 1):
-            if any(op in line for op in ['/', '//', '%', '**']):
-                if 'if' not in line and 'assert' not in line:
-                    # Check if there's a division that could cause division by zero
-                    if '/' in line and 'zero' not in line.lower():
-                        issues.append(SecurityIssue(
-                            severity="MEDIUM", 
-                            category="Division by Zero",
-                            description="Potential division by zero without validation",
+            # Check for missing range checks on critical calculations: a
+            # division that could cause division by zero
+            if '/' in line and 'if' not in line and 'assert' not in line and 'zero' not in line.lower():
+                division.append(SecurityIssue(
+                    severity="MEDIUM", 
+                    category="Division by Zero",
+                    description="Potential division by zero without validation",
+                    file=filename,
+                    line=i,
+                    recommendation="Add zero checks before division operations"
+                ))
+            
+            # Look for subprocess calls, os.system, eval, exec
+            found = _DANGEROUS_RE.findall(line)
+            if found:
+                for func in _DANGEROUS_FUNCTIONS:
+                    if func in found:
+                        commands.append(SecurityIssue(
+                            severity="HIGH" if func in _HIGH_RISK_FUNCTIONS else "MEDIUM",
+                            category="Command Injection",
+                            description=f"Use of potentially dangerous function: {func}",
+                            file=filename,
+                            line=i,
+                            recommendation=f"Avoid {func} or ensure input is properly sanitized"
+                        ))
+            
+            # Path operations that might be vulnerable
+            if _PATH_ANY.search(line):
+                for pattern, regex in _PATH_PATTERNS:
+                    if regex.search(line):
+                        paths.append(SecurityIssue(
+                            severity="MEDIUM",
+                            category="Path Traversal",
+                            description=f"Potential path traversal pattern: {pattern}",
+                            file=filename,
+                            line=i,
+                            recommendation="Validate and sanitize file paths"
+                        ))
+            
+            # Look for hardcoded secrets or sensitive data
+            if _SENSITIVE_ANY.search(line):
+                for regex, description in _SENSITIVE_PATTERNS:
+                    if regex.search(line):
+                        secrets.append(SecurityIssue(
+                            severity="HIGH",
+                            category="Data Exposure",
+                            description=description,
                             file=filename,
                             line=i,
-                            recommendation="Add zero checks before division operations"
+                            recommendation="Move sensitive data to environment variables or config files"
                         ))
         
-        return issues
+        return {
+            "Division by Zero": division,
+            "Command Injection": commands,
+            "Path Traversal": paths,
+            "Data Exposure": secrets,
+        }
     
-    def _check_file_operations(self, tree: ast.AST, lines: List[str], filename: str) -> List[SecurityIssue]:
+    def _check_file_operations(self, nodes: Dict[type, List[ast.AST]], lines: List[str], filename: str) -> List[SecurityIssue]:
         """Check for unsafe file operations"""
         issues = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                # Check for open() calls without proper error handling
-                if (isinstance(node.func, ast.Name) and node.func.id == 'open') or \
-                   (isinstance(node.func, ast.Attribute) and node.func.attr == 'open'):
-                    
-                    # Check if it's in a try-except block
-                    parent = self._find_parent_try(tree, node)
-                    if not parent:
+        for node in nodes[ast.Call]:
+            # Check for open() calls without proper error handling
+            if (isinstance(node.func, ast.Name) and node.func.id == 'open') or \
+               (isinstance(node.func, ast.Attribute) and node.func.attr == 'open'):
+                
+                # Check if it's in a try-except block
+                parent = self._find_parent_try(None, node)
+                if not parent:
+                    issues.append(SecurityIssue(
+                        severity="LOW",
+                        category="File Operations",
+                        description="File open operation without exception handling",
+                        file=filename,
+                        line=node.lineno,
+                        recommendation="Wrap file operations in try-except blocks"
+                    ))
+                
+                # Check for unsafe file modes
+                if len(node.args) > 1:
+                    mode_arg = node.args[1]
+                    if isinstance(mode_arg, ast.Str) and 'w' in mode_arg.s:
                         issues.append(SecurityIssue(
                             severity="LOW",
-                            category="File Operations",
-                            description="File open operation without exception handling",
+                            category="File Operations", 
+                            description="File opened in write mode - potential data loss",
                             file=filename,
                             line=node.lineno,
-                            recommendation="Wrap file operations in try-except blocks"
+                            recommendation="Consider backup strategies for write operations"
                         ))
-                    
-                    # Check for unsafe file modes
-                    if len(node.args) > 1:
-                        mode_arg = node.args[1]
-                        if isinstance(mode_arg, ast.Str) and 'w' in mode_arg.s:
-                            issues.append(SecurityIssue(
-                                severity="LOW",
-                                category="File Operations", 
-                                description="File opened in write mode - potential data loss",
-                                file=filename,
-                                line=node.lineno,
-                                recommendation="Consider backup strategies for write operations"
-                            ))
-        
-        return issues
-    
-    def _check_command_injection(self, content: str, lines: List[str], filename: str) -> List[SecurityIssue]:
-        """Check for potential command injection vulnerabilities"""
-        issues = []
-        
-        # Look for subprocess calls, os.system, eval, exec
-        dangerous_functions = ['subprocess', 'os.system', 'eval', 'exec', 'compile']
-        
-        for i, line in enumerate(lines, 1):
-            for func in dangerous_functions:
-                if func in line:
-                    issues.append(SecurityIssue(
-                        severity="HIGH" if func in ['eval', 'exec'] else "MEDIUM",
-                        category="Command Injection",
-                        description=f"Use of potentially dangerous function: {func}",
-                        file=filename,
-                        line=i,
-                        recommendation=f"Avoid {func} or ensure input is properly sanitized"
-                    ))
         
         return issues
     
-    def _check_path_traversal(self, content: str, lines: List[str], filename: str) -> List[SecurityIssue]:
-        """Check for path traversal vulnerabilities"""
-        issues = []
-        
-        # Look for path operations that might be vulnerable
-        path_patterns = [
-            r'\.\./',  # Directory traversal
-            r'\.\.\\', # Windows directory traversal
-            r'/etc/',  # Unix system files
-            r'C:\\',   # Windows system paths
-        ]
-        
-        for i, line in enumerate(lines, 1):
-            for pattern in path_patterns:
-                if re.search(pattern, line):
-                    issues.append(SecurityIssue(
-                        severity="MEDIUM",
-                        category="Path Traversal",
-                        description=f"Potential path traversal pattern: {pattern}",
-                        file=filename,
-                        line=i,
-                        recommendation="Validate and sanitize file paths"
-                    ))
-        
-        return issues
-    
-    def _check_exception_handling(self, tree: ast.AST, lines: List[str], filename: str) -> List[SecurityIssue]:
+    def _check_exception_handling(self, nodes: Dict[type, List[ast.AST]], lines: List[str], filename: str) -> List[SecurityIssue]:
         """Check for poor exception handling practices"""
         issues = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ExceptHandler):
-                # Check for bare except clauses
-                if node.type is None:
-                    issues.append(SecurityIssue(
-                        severity="MEDIUM",
-                        category="Exception Handling",
-                        description="Bare except clause can hide errors",
-                        file=filename,
-                        line=node.lineno,
-                        recommendation="Catch specific exceptions instead of using bare except"
-                    ))
-                
-                # Check for exceptions that print sensitive information
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Call) and isinstance(child.func, ast.Name):
-                        if child.func.id == 'print':
-                            issues.append(SecurityIssue(
-                                severity="LOW",
-                                category="Information Disclosure",
-                                description="Exception handler prints information that might be sensitive",
-                                file=filename,
-                                line=child.lineno,
-                                recommendation="Log errors securely instead of printing"
-                            ))
+        for node in nodes[ast.ExceptHandler]:
+            # Check for bare except clauses
+            if node.type is None:
+                issues.append(SecurityIssue(
+                    severity="MEDIUM",
+                    category="Exception Handling",
+                    description="Bare except clause can hide errors",
+                    file=filename,
+                    line=node.lineno,
+                    recommendation="Catch specific exceptions instead of using bare except"
+                ))
+            
+            # Check for exceptions that print sensitive information
+            for child in ast.walk(node):
+                if isinstance(child, ast.Call) and isinstance(child.func, ast.Name):
+                    if child.func.id == 'print':
+                        issues.append(SecurityIssue(
+                            severity="LOW",
+                            category="Information Disclosure",
+                            description="Exception handler prints information that might be sensitive",
+                            file=filename,
+                            line=child.lineno,
+                            recommendation="Log errors securely instead of printing"
+                        ))
         
         return issues
     
@@ -241,32 +304,6 @@ class SecurityAnalyzer:
         
         return issues
     
-    def _check_data_exposure(self, tree: ast.AST, lines: List[str], filename: str) -> List[SecurityIssue]:
-        """Check for potential data exposure issues"""
-        issues = []
-        
-        # Look for hardcoded secrets or sensitive data
-        sensitive_patterns = [
-            (r'password\s*=\s*["\'][^"\']+["\']', "Hardcoded password"),
-            (r'api_key\s*=\s*["\'][^"\']+["\']', "Hardcoded API key"),
-            (r'secret\s*=\s*["\'][^"\']+["\']', "Hardcoded secret"),
-            (r'token\s*=\s*["\'][^"\']+["\']', "Hardcoded token"),
-        ]
-        
-        for i, line in enumerate(lines, 1):
-            for pattern, description in sensitive_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    issues.append(SecurityIssue(
-                        severity="HIGH",
-                        category="Data Exposure",
-                        description=description,
-                        file=filename,
-                        line=i,
-                        recommendation="Move sensitive data to environment variables or config files"
-                    ))
-        
-        return issues
-    
     def _has_user_input_params(self, func_node: ast.FunctionDef) -> bool:
         """Check if function accepts user input parameters"""
         # Simple heuristic: functions with certain parameter names or patterns
@@ -298,16 +335,33 @@ class SecurityAnalyzer:
         # For now, just return None as it's complex to implement properly
         return None
     
-    def analyze_all_files(self) -> Dict[str, Any]:
-        """Analyze all Python files in the project"""
+    def analyze_all_files(self, parallel: bool = True) -> Dict[str, Any]:
+        """
+        Analyze all Python files in the project
+        
+        Args:
+            parallel: Spread the files over a process pool (one worker per core);
+                runs serially when there is only one file or one core
+        """
         all_issues = []
+        filepaths = [
+            os.path.join(root, file)
+            for root, dirs, files in os.walk(self.base_path)
+            for file in files
+            if file.endswith('.py')
+        ]
         
-        for root, dirs, files in os.walk(self.base_path):
-            for file in files:
-                if file.endswith('.py'):
-                    filepath = os.path.join(root, file)
-                    file_issues = self.analyze_file(filepath)
+        workers = min(len(filepaths), os.cpu_count() or 1)
+        if parallel and workers > 1:
+            chunksize = max(1, len(filepaths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker,
+                                     initargs=(self.base_path,)) as executor:
+                # map() yields in submission order, so the report order is preserved
+                for file_issues in executor.map(_analyze_one, filepaths, chunksize=chunksize):
                     all_issues.extend(file_issues)
+        else:
+            for filepath in filepaths:
+                all_issues.extend(self.analyze_file(filepath))
         
         self.issues = all_issues
         return self._generate_security_summary()
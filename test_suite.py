@@ -235,6 +235,107 @@ class TestEdgeCases(unittest.TestCase):
         self.assertEqual(len(mop_str.split('.')[-1]), 6,
                         msg="Result should have 6 decimal places precision")
 
+class TestCompiledKernels(unittest.TestCase):
+    """Test suite for the compilable kernels in mop_kernels.py"""
+    
+    def test_kernels_match_reference(self):
+        """Kernels should reproduce the MOP.py reference results"""
+        import mop_kernels
+        
+        cases = [
+            (45, 8, 20.0, 0.2124, 0.2160, 0.0),
+            (32, 8, 20.0, 0.2124, 0.2160, 15.0),
+            (127, 12, 20.0, 0.1309, 0.144, -10.5),
+            (36, 12, 20.0, 0.1309, 0.140, 30.0),
+        ]
+        
+        for z, dp, pa, t, d, helix in cases:
+            external = mow_helical_external_dp(z, dp, pa, t, d, helix)
+            internal = mbp_helical_internal_dp(z, dp, pa, t, d, helix)
+            for reference, values in (
+                (external, mop_kernels.mow_helical_external_core(z, dp, pa, t, d, helix)),
+                (internal, mop_kernels.mbp_helical_internal_core(z, dp, pa, t, d, helix)),
+            ):
+                self.assertAlmostEqual(values[0], reference.MOW, places=12,
+                                       msg=f"Kernel result should match MOP.py (z={z}, helix={helix})")
+                self.assertAlmostEqual(values[6], reference.beta_rad, places=12)
+
+    def test_batch_kernel_matches_reference(self):
+        """Vectorized batch kernel should reproduce the MOP.py reference results"""
+        try:
+            import mop_batch
+        except ImportError:
+            self.skipTest("NumPy not available")
+
+        cases = [
+            (45, 8, 20.0, 0.2124, 0.2160, 0.0, False),
+            (32, 8, 20.0, 0.2124, 0.2160, 15.0, False),
+            (127, 12, 20.0, 0.1309, 0.144, -10.5, True),
+            (36, 12, 20.0, 0.1309, 0.140, 30.0, True),
+        ]
+
+        MOW, Dp, Db, beta_deg = mop_batch.mop_batch(*zip(*cases))
+        for i, (z, dp, pa, t, d, helix, internal) in enumerate(cases):
+            calculate = mbp_helical_internal_dp if internal else mow_helical_external_dp
+            reference = calculate(z, dp, pa, t, d, helix)
+            self.assertAlmostEqual(MOW[i], reference.MOW, places=12,
+                                   msg=f"Batch result should match MOP.py (z={z}, helix={helix})")
+            self.assertAlmostEqual(beta_deg[i], reference.beta_deg, places=10)
+
+    def test_batch_kernel_random_cases(self):
+        """Batch kernel should match MOP.py to a few ULP and flag rows it cannot solve"""
+        try:
+            import mop_batch
+        except ImportError:
+            self.skipTest("NumPy not available")
+        import math
+        import random
+
+        rng = random.Random(20000)
+        cases = [(rng.randint(6, 200), rng.uniform(1.0, 40.0), rng.uniform(10.0, 35.0),
+                  rng.uniform(0.01, 0.5), rng.uniform(0.01, 0.5),
+                  rng.choice([0.0, rng.uniform(-40.0, 40.0)]), rng.random() < 0.5)
+                 for _ in range(2000)]
+        cases.append((139, 32.89, 27.13, 0.0438, 0.4324, 0.0, True))  # Diverging solve
+        cases.append((40, 8.0, 20.0, 0.0, 0.216, 0.0, False))         # Non-positive thickness
+
+        MOW = mop_batch.mop_batch(*zip(*cases))[0]
+        self.assertTrue(math.isnan(MOW[-1]), "Non-positive thickness should be flagged")
+        self.assertTrue(math.isnan(MOW[-2]), "Unconverged solve should be flagged")
+        flagged = 0
+        for i, (z, dp, pa, t, d, helix, internal) in enumerate(cases[:-1]):
+            if math.isnan(MOW[i]):
+                flagged += 1
+                continue
+            calculate = mbp_helical_internal_dp if internal else mow_helical_external_dp
+            reference = calculate(z, dp, pa, t, d, helix).MOW
+            self.assertAlmostEqual(MOW[i], reference, delta=1e-12 * max(1.0, abs(reference)),
+                                   msg=f"Batch result should match MOP.py for {cases[i]}")
+        self.assertLess(flagged, len(cases) // 2, "Most random cases should be solved")
+
+    def test_parallel_batch_kernel_matches_reference(self):
+        """Parallel spur batch kernel should reproduce the MOP.py reference results"""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy not available")
+        import mop_kernels
+
+        cases = [
+            (45, 8.0, 20.0, 0.2124, 0.2160),
+            (32, 8.0, 20.0, 0.2124, 0.2160),
+            (127, 12.0, 20.0, 0.1309, 0.144),
+            (36, 12.0, 25.0, 0.1309, 0.140),
+        ]
+
+        z, dp, pa, t, d = (np.array(column) for column in zip(*cases))
+        MOW = mop_kernels.mow_spur_external_batch_core(z, dp, pa, t, d, np.empty(len(cases)))
+        for i, case in enumerate(cases):
+            self.assertAlmostEqual(MOW[i], mow_spur_external_dp(*case).MOW, places=12,
+                                   msg=f"Parallel batch result should match MOP.py (z={case[0]})")
+        with self.assertRaises(ValueError):
+            mop_kernels.mow_spur_external_batch_core(-z, dp, pa, t, d, np.empty(len(cases)))
+
 @unittest.skipUnless(API_AVAILABLE, "API modules not available")
 class TestAPIs(unittest.TestCase):
     """Test suite for API functionality"""
@@ -388,6 +489,7 @@ def run_test_suite():
         TestSpurGears,
         TestHelicalGears, 
         TestEdgeCases,
+        TestCompiledKernels,
         TestAPIs,
         TestFileProcessing,
         TestPerformance